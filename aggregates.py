@@ -0,0 +1,137 @@
+import os
+import numpy as np
+import pandas as pd
+from dataset import DATA_DIR, Dataset
+from data_store import get_data_store
+from caching import LRUCache
+
+
+AGGREGATE_DIR = os.path.join(DATA_DIR, "aggregates")
+
+# Per-artist summary tables the pages read instead of recomputing them on every rerun.
+# Stored like the source tables (base + per-artist fragments, merged by key), under data/aggregates/
+VIEWS = {
+    'overview': Dataset("overview", keys=['artist_id'], sort_by='artist_id', root=AGGREGATE_DIR),
+    'roles': Dataset("roles", keys=['artist_id', 'role'], sort_by='artist_id', root=AGGREGATE_DIR),
+    'collaborators': Dataset("collaborators", keys=['artist_id', 'collaborator'], sort_by='artist_id',
+                             root=AGGREGATE_DIR),
+    'roles_per_year': Dataset("roles_per_year", keys=['artist_id', 'year', 'label'], sort_by='artist_id',
+                              root=AGGREGATE_DIR),
+    'song_diversity': Dataset("song_diversity", keys=['artist_id', 'song_id'], sort_by='artist_id',
+                              root=AGGREGATE_DIR)
+}
+
+# Value columns of each view (besides artist_id) and their dtypes, so empty reads still have the page's schema
+VIEW_COLUMNS = {
+    'overview': {'total_songs': 'int64', 'total_views': 'float64', 'avg_views': 'float64',
+                 'source_signature': 'object'},
+    'roles': {'role': 'object', 'contributors': 'int64', 'songs': 'int64'},
+    'collaborators': {'collaborator': 'object', 'songs': 'int64', 'roles': 'object'},
+    'roles_per_year': {'year': 'int64', 'label': 'object', 'count': 'int64'},
+    'song_diversity': {'song_id': 'Int64', 'unique_roles': 'int64', 'total_contributors': 'int64',
+                       'title': 'object', 'pageviews': 'float64'}
+}
+
+SOURCE_SONG_COLUMNS = ['song_id', 'title', 'release_date', 'pageviews']
+
+READ_CACHE_SIZE = 128
+_read_cache = LRUCache(READ_CACHE_SIZE)
+
+
+def compute_artist_aggregates(store, artist_id):
+    """All views for one artist, from the data store's per-artist slices."""
+    songs = store.artist_songs(artist_id, columns=SOURCE_SONG_COLUMNS)
+    contributors = store.artist_contributors(artist_id)
+
+    overview = pd.DataFrame({
+        'total_songs': [len(songs)],
+        'total_views': [songs['pageviews'].sum()],
+        'avg_views': [songs['pageviews'].mean() if len(songs) > 0 else np.nan],
+        # Hash of the rows the views were computed from, to tell when they are stale
+        'source_signature': [store.artist_signature(artist_id)]
+    })
+
+    roles = contributors.groupby('label').agg(
+        contributors=('artist_name', 'nunique'),
+        songs=('song_id', 'nunique')
+    ).reset_index().rename(columns={'label': 'role'})
+
+    # Sorted distinct roles per collaborator, joined once here instead of a lambda per group on each rerun
+    collaborator_roles = (contributors[['artist_name', 'label']].drop_duplicates()
+                          .sort_values(['artist_name', 'label'])
+                          .groupby('artist_name')['label'].agg(', '.join))
+    collaborators = contributors.groupby('artist_name').agg(songs=('song_id', 'nunique'))
+    collaborators['roles'] = collaborator_roles
+    collaborators = collaborators.reset_index().rename(columns={'artist_name': 'collaborator'})
+
+    role_timeline = contributors[['song_id', 'label']].merge(songs[['song_id', 'release_date']], on='song_id')
+    role_timeline['year'] = pd.to_datetime(role_timeline['release_date'], errors='coerce').dt.year
+    roles_per_year = role_timeline.groupby(['year', 'label']).size().reset_index(name='count')
+    roles_per_year['year'] = roles_per_year['year'].astype('int64')
+
+    song_diversity = contributors.groupby('song_id').agg(
+        unique_roles=('label', 'nunique'),
+        total_contributors=('artist_name', 'count')
+    ).reset_index().merge(songs[['song_id', 'title', 'pageviews']], on='song_id')
+
+    return {
+        'overview': overview,
+        'roles': roles,
+        'collaborators': collaborators,
+        'roles_per_year': roles_per_year,
+        'song_diversity': song_diversity
+    }
+
+
+def _stored_rows(dataset, artist_id):
+    rows = dataset.read(filters=[('artist_id', '==', artist_id)], partition=artist_id)
+    if 'artist_id' in rows.columns:
+        return rows
+    schema = {'artist_id': 'int64', **VIEW_COLUMNS[dataset.name], 'removed': 'bool'}
+    return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in schema.items()})
+
+
+def refresh_artist_aggregates(artist_id, store=None):
+    """
+    Recompute one artist's views and write only the rows that changed (Dataset.upsert).
+    Rows the artist no longer has are kept as tombstones (removed=True) that reads skip.
+    """
+    store = store or get_data_store()
+    artist_id = int(artist_id)
+
+    for name, frame in compute_artist_aggregates(store, artist_id).items():
+        dataset = VIEWS[name]
+        frame = frame.assign(artist_id=artist_id, removed=False)
+
+        stored = _stored_rows(dataset, artist_id)
+        live = stored[~stored['removed'].astype(bool)]
+        if not live.empty:
+            gone = ~pd.MultiIndex.from_frame(live[dataset.keys]).isin(pd.MultiIndex.from_frame(frame[dataset.keys]))
+            frame = pd.concat([frame, live[gone].assign(removed=True)], ignore_index=True)
+
+        dataset.upsert(frame, partition=artist_id)
+
+
+def artist_aggregate(name, artist_id, store=None):
+    """
+    One view's rows for an artist. Computed and stored on first use, and refreshed when the
+    artist's song or credit rows were added, removed or updated since; reads are cached per view version.
+    """
+    store = store or get_data_store()
+    artist_id = int(artist_id)
+
+    overview = _read(VIEWS['overview'], artist_id)
+    stored = None if overview.empty or 'source_signature' not in overview.columns else overview['source_signature'].iloc[0]
+    if stored != store.artist_signature(artist_id):
+        refresh_artist_aggregates(artist_id, store)
+
+    return _read(VIEWS[name], artist_id)
+
+
+def _read(dataset, artist_id):
+    """Stored rows of one view for an artist; a copy, so callers may rename or sort it in place."""
+    def read():
+        rows = _stored_rows(dataset, artist_id)
+        return rows[~rows['removed'].astype(bool)].drop(columns=['removed', 'artist_id']).reset_index(drop=True)
+
+    return _read_cache.get_or_compute((dataset.name, artist_id, dataset.version), read).copy()
@@ -1,9 +1,10 @@
 import os
 import streamlit as st
-import pandas as pd
 from dotenv import load_dotenv
 from genius_client import GeniusClient
 import utils as ut
+from data_store import get_data_store
+from image_cache import image_source, HEADER_SIZE
 
 
 load_dotenv()
@@ -24,12 +25,9 @@ if 'selected_artist' not in st.session_state:
     st.session_state.selected_artist = None
 if 'artist_id' not in st.session_state:
     st.session_state.artist_id = None
-if 'existing_artist_df' not in st.session_state:
-    st.session_state.existing_artist_df = pd.read_parquet("data/artist_data.parquet")
-if 'existing_song_df' not in st.session_state:
-    st.session_state.existing_song_df = pd.read_parquet("data/song_data.parquet")
-if 'existing_contributor_df' not in st.session_state:
-        st.session_state.existing_contributor_df = pd.read_parquet("data/contributer_data.parquet")
+
+# Tables are loaded once per process and shared by all sessions
+store = get_data_store()
 
 # Pages
 overview_page = st.Page("pages/overview.py", title="Artist Overview", icon="🎵")
@@ -45,7 +43,7 @@ with st.sidebar:
     st.title("🎵 Select Artist")
     
     available_artists = sorted(
-        st.session_state.existing_artist_df['name'].unique().tolist()
+        store.artists['name'].unique().tolist()
     )
     
     selected_artist = st.selectbox(
@@ -63,7 +61,7 @@ with st.sidebar:
         fetch_contributors = st.checkbox(
             "Fetch contributors", 
             value=True, 
-            help="Takes 2-5 minutes. Uncheck for faster artist loading."
+            help="Takes a few extra seconds. Uncheck for faster artist loading."
         )
     else:
         fetch_contributors = False
@@ -80,13 +78,12 @@ with st.sidebar:
             st.rerun()
     
     if st.session_state.selected_artist and st.session_state.artist_id:
-        artist_row = st.session_state.existing_artist_df[
-            st.session_state.existing_artist_df['name'] == st.session_state.selected_artist
-        ]
+        artist_df = store.artists
+        artist_row = artist_df[artist_df['name'] == st.session_state.selected_artist]
         if not artist_row.empty:
             st.divider()
             img_url = artist_row.iloc[0].get('header_image_url')
             if img_url:
-                st.image(img_url, caption=st.session_state.selected_artist)
+                st.image(image_source(img_url, HEADER_SIZE), caption=st.session_state.selected_artist)
     
 pg.run()
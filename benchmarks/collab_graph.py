@@ -0,0 +1,63 @@
+"""
+Benchmark for collab_graph.CollabGraph on synthetic credit tables from 10k to 1M rows:
+full build, an incremental ingest of one artist's worth of credits, and per-query latency.
+
+    python benchmarks/collab_graph.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from collab_graph import CollabGraph
+from collaborators import make_data
+
+
+SIZES = [10_000, 100_000, 1_000_000]
+INGEST_ROWS = 2_000
+QUERIES = 200
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def per_query_ms(fn, artist_ids):
+    start = time.perf_counter()
+    for artist_id in artist_ids:
+        fn(artist_id)
+    return (time.perf_counter() - start) / len(artist_ids) * 1000
+
+
+def main():
+    print(f"{'credits':>10} {'edges':>10} {'build (s)':>10} {'ingest (s)':>11} "
+          f"{'top10 (ms)':>11} {'2-hop (ms)':>11} {'path (ms)':>10}")
+    for n in SIZES:
+        _, contributors = make_data(n)
+        contributors['song_id'] = contributors['song_id'].astype('int64')
+        base, ingest = contributors.iloc[:-INGEST_ROWS], contributors.iloc[-INGEST_ROWS:]
+
+        graph = CollabGraph()
+        # Synthetic data, so skip the dataset refresh that queries normally do first
+        graph.refresh = lambda: None
+        _, build = timed(graph.add_credits, base)
+        _, ingest_time = timed(graph.add_credits, ingest)
+
+        rng = np.random.default_rng(1)
+        artist_ids = rng.choice(graph.ids, QUERIES)
+        targets = rng.choice(graph.ids, QUERIES)
+
+        top = per_query_ms(lambda a: graph.neighbors(a, top_n=10), artist_ids)
+        two_hop = per_query_ms(lambda a: graph.k_hop(a, k=2, max_nodes=500), artist_ids)
+        path = per_query_ms(lambda a: graph.shortest_path(a, targets[0]), artist_ids)
+
+        print(f"{n:>10,} {len(graph.edge_keys):>10,} {build:>10.2f} {ingest_time:>11.3f} "
+              f"{top:>11.3f} {two_hop:>11.3f} {path:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
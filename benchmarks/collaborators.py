@@ -0,0 +1,87 @@
+"""
+Benchmark for network.get_collaborators on synthetic credit tables from 1k to 1M rows.
+
+    python benchmarks/collaborators.py
+
+The row-by-row implementation it replaced is kept below for comparison; it is only run
+up to 100k rows because it gets too slow beyond that.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import network as netwrk
+
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+LEGACY_MAX_ROWS = 100_000
+ROLES = ['Writer', 'Producer', 'Publisher', 'Mixing Engineer', 'Featured Artist', 'Label', 'Composer']
+
+
+def make_data(n_credits, seed=0):
+    rng = np.random.default_rng(seed)
+    n_songs = max(n_credits // 12, 1)
+    n_people = max(n_credits // 8, 1)
+
+    songs = pd.DataFrame({
+        'song_id': np.arange(n_songs),
+        'title': [f"Song {i}" for i in range(n_songs)]
+    })
+    # Skewed popularity, so a few collaborators have thousands of credits
+    people = rng.zipf(1.3, n_credits) % n_people
+    contributors = pd.DataFrame({
+        'song_id': rng.integers(0, n_songs, n_credits),
+        'artist_id': people,
+        'artist_name': pd.Series(people).map(lambda i: f"Person {i}").to_numpy(),
+        'label': rng.choice(ROLES, n_credits)
+    })
+    return songs, contributors
+
+
+def legacy_get_collaborators(main_artist, df_songs, df_contributors):
+    collaborators = {}
+    song_ids = df_songs['song_id'].tolist()
+    song_titles = dict(zip(df_songs['song_id'], df_songs['title']))
+    artist_contributors = df_contributors[df_contributors['song_id'].isin(song_ids)]
+
+    for _, row in artist_contributors.iterrows():
+        name = row.get('artist_name')
+        role = row.get('label', 'Contributor')
+        song_title = song_titles.get(row.get('song_id'), 'Unknown')
+
+        if name and name != main_artist:
+            if name not in collaborators:
+                collaborators[name] = {'count': 0, 'roles': set(), 'songs': []}
+            collaborators[name]['count'] += 1
+            collaborators[name]['roles'].add(role)
+            if song_title not in collaborators[name]['songs']:
+                collaborators[name]['songs'].append(song_title)
+    return collaborators
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    print(f"{'credits':>10} {'vectorized (s)':>15} {'iterrows (s)':>13} {'speedup':>8}")
+    for n in SIZES:
+        songs, contributors = make_data(n)
+        result, fast = timed(netwrk.get_collaborators, "Person 0", songs, contributors)
+
+        if n <= LEGACY_MAX_ROWS:
+            expected, slow = timed(legacy_get_collaborators, "Person 0", songs, contributors)
+            assert result == expected and list(result) == list(expected)
+            print(f"{n:>10,} {fast:>15.3f} {slow:>13.3f} {slow / fast:>7.0f}x")
+        else:
+            print(f"{n:>10,} {fast:>15.3f} {'-':>13} {'-':>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+_MISSING = object()
+
+
+class LRUCache():
+    """
+    Small thread-safe in-memory LRU for derived values (rendered graphs, per-artist frames).
+    compute() runs outside the lock; keys should include whatever version the value depends on.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+
+    def __len__(self):
+        return len(self.entries)
+
+
+    def get_or_compute(self, key, compute):
+        """Cached value for key, or compute() it and keep it (None results are cached too)."""
+        with self.lock:
+            value = self.entries.get(key, _MISSING)
+            if value is not _MISSING:
+                self.entries.move_to_end(key)
+                return value
+
+        value = compute()
+
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return value
+
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class ContentStore():
+    """
+    Content-addressed LRU store backed by SQLite, shared by the response and image caches.
+
+    Entries map a key to a blob (sha256 of its content), so identical content is kept once, plus
+    a few metadata columns of the caller's choosing. Blobs live in the database, or as files under
+    blob_dir when given (so they can be served directly). The least recently used entries, and the
+    blobs no entry points to any more, are evicted once the blobs exceed max_bytes.
+    """
+
+    def __init__(self, db_path, max_bytes, blob_dir=None, blob_suffix="", columns=()):
+        self.max_bytes = max_bytes
+        self.blob_dir = blob_dir
+        self.blob_suffix = blob_suffix
+        self.columns = list(columns)
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        if blob_dir:
+            os.makedirs(blob_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        extra_columns = "".join(f", {column}" for column in self.columns)
+        self.conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS blobs (
+                blob_hash TEXT PRIMARY KEY,
+                body BLOB,
+                path TEXT,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                entry_key TEXT PRIMARY KEY,
+                blob_hash TEXT NOT NULL,
+                accessed_at REAL NOT NULL{extra_columns}
+            );
+            CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+        """)
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+
+    def get(self, key):
+        """(body or file path, {metadata column: value}) for key, or None; marks the entry as used."""
+        selected = "".join(f", e.{column}" for column in self.columns)
+        with self.lock:
+            row = self.conn.execute(
+                f"SELECT b.body, b.path{selected} FROM entries e JOIN blobs b ON b.blob_hash = e.blob_hash "
+                "WHERE e.entry_key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            body, path, *values = row
+            if path is not None and not os.path.exists(path):
+                return None
+            self.conn.execute("UPDATE entries SET accessed_at = ? WHERE entry_key = ?", (time.time(), key))
+            self.conn.commit()
+
+        return (path if path is not None else body), dict(zip(self.columns, values))
+
+
+    def _write_file(self, blob_hash, data):
+        path = os.path.join(self.blob_dir, blob_hash[:2], f"{blob_hash}{self.blob_suffix}")
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return path
+
+
+    def put(self, key, data, **metadata):
+        """Store data under key (replacing what key held) and return its file path, or None for inline blobs."""
+        blob_hash = hashlib.sha256(data).hexdigest()
+        path = self._write_file(blob_hash, data) if self.blob_dir else None
+        columns = ["entry_key", "blob_hash", "accessed_at"] + list(metadata)
+
+        with self.lock:
+            inserted = self.conn.execute(
+                "INSERT OR IGNORE INTO blobs (blob_hash, body, path, size) VALUES (?, ?, ?, ?)",
+                (blob_hash, None if path else data, path, len(data))
+            ).rowcount
+            self.total_bytes += len(data) if inserted else 0
+
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO entries ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                (key, blob_hash, time.time(), *metadata.values())
+            )
+            self._evict(keep=key)
+            self.conn.commit()
+        return path
+
+
+    def update(self, key, **metadata):
+        """Set metadata columns of an existing entry and mark it as used."""
+        assignments = "".join(f", {column} = ?" for column in metadata)
+        with self.lock:
+            self.conn.execute(
+                f"UPDATE entries SET accessed_at = ?{assignments} WHERE entry_key = ?",
+                (time.time(), *metadata.values(), key)
+            )
+            self.conn.commit()
+
+
+    def _evict(self, keep=None):
+        """Drop least recently used entries (never `keep`, the one just stored) and their orphaned blobs."""
+        while self.total_bytes > self.max_bytes:
+            oldest = self.conn.execute(
+                "SELECT entry_key FROM entries WHERE entry_key != ? ORDER BY accessed_at LIMIT 64", (keep or "",)
+            ).fetchall()
+            if not oldest:
+                break
+            self.conn.executemany("DELETE FROM entries WHERE entry_key = ?", oldest)
+
+            orphans = self.conn.execute(
+                "SELECT blob_hash, path FROM blobs WHERE blob_hash NOT IN (SELECT blob_hash FROM entries)"
+            ).fetchall()
+            self.conn.executemany("DELETE FROM blobs WHERE blob_hash = ?", [(h,) for h, _ in orphans])
+            for _, path in orphans:
+                if path is None:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
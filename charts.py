@@ -0,0 +1,88 @@
+import numpy as np
+import plotly.graph_objects as go
+
+
+# Above this many songs the timeline switches to WebGL traces
+WEBGL_THRESHOLD = 1000
+# Larger catalogs are downsampled to this many songs, keeping the peaks
+MAX_TIMELINE_POINTS = 4000
+
+
+def downsample_timeline(timeline_df, max_points=MAX_TIMELINE_POINTS):
+    """
+    At most max_points songs, in release order: the most viewed half of the budget overall, plus the
+    most viewed song in each of max_points / 2 equal time bins, so both hits and the spread over time survive.
+    """
+    if len(timeline_df) <= max_points:
+        return timeline_df
+
+    views = timeline_df['pageviews'].fillna(0).to_numpy(dtype=float)
+    dates = timeline_df['release_date'].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+
+    top = np.argpartition(-views, max_points // 2)[:max_points // 2]
+    bins = np.linspace(dates.min(), dates.max(), max_points // 2 + 1)[1:-1]
+    bin_of = np.searchsorted(bins, dates, side='right')
+    # Within each bin (rows sorted by bin, then views descending) the first row is the peak
+    order = np.lexsort((-views, bin_of))
+    peaks = order[np.r_[True, bin_of[order][1:] != bin_of[order][:-1]]]
+
+    keep = np.unique(np.concatenate([top, peaks]))[:max_points]
+    return timeline_df.iloc[keep]
+
+
+def release_timeline(timeline_df, height=350):
+    """
+    Stem chart of page views per release (timeline_df sorted by release_date, with title and pageviews).
+    Always two traces, whatever the catalog size: every stem in one line trace (broken up by NaN) and one marker trace.
+    """
+    shown = downsample_timeline(timeline_df)
+    scatter = go.Scattergl if len(shown) > WEBGL_THRESHOLD else go.Scatter
+
+    dates = shown['release_date'].to_numpy()
+    views = shown['pageviews'].to_numpy(dtype=float, na_value=np.nan)
+
+    fig = go.Figure()
+    fig.add_trace(scatter(
+        x=np.repeat(dates, 3),
+        y=np.column_stack([np.zeros(len(views)), views, np.full(len(views), np.nan)]).ravel(),
+        mode='lines',
+        line=dict(color='rgba(255,75,75,0.3)', width=3),
+        showlegend=False,
+        hoverinfo='none'
+    ))
+
+    fig.add_trace(scatter(
+        x=dates,
+        y=views,
+        mode='markers',
+        marker=dict(
+            size=12,
+            color=views,
+            colorscale='Plasma',
+            showscale=False
+        ),
+        text=shown['title'],
+        hovertemplate="<b>%{text}</b><br>%{x|%b %Y}<br>Views: %{y:,}<extra></extra>",
+        showlegend=False
+    ))
+
+    fig.update_layout(
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        height=height,
+        xaxis=dict(
+            showgrid=False,
+            showline=True,
+            linecolor='#333',
+            tickfont=dict(color='#888')
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor='#333',
+            gridwidth=1,
+            tickfont=dict(color='#888'),
+            title="Page Views"
+        ),
+        margin=dict(l=0, r=0, t=20, b=0)
+    )
+    return fig
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict, namedtuple
+
+import streamlit as st
+
+from caching import ContentStore
+from dataset import ARTIST_DATA
+
+
+CACHE_DIR = "cache"
+
+
+def normalize_name(name):
+    return " ".join(str(name).split()).casefold()
+
+
+class ArtistIdCache():
+    """
+    Persistent artist name -> Genius ID map with TTL and LRU eviction.
+    Seeded from the local artist data ('name' and 'alternate_names') so known artists never hit /search.
+    """
+
+    def __init__(self, path=os.path.join(CACHE_DIR, "artist_ids.json"), ttl=30 * 24 * 3600,
+                 max_entries=10000, seed_dataset=ARTIST_DATA):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.lock = threading.RLock()
+        self.entries = OrderedDict()
+
+        self._load()
+        if seed_dataset is not None:
+            self.seed_from_dataset(seed_dataset)
+
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        for name, (artist_id, stored_at) in stored.items():
+            self.entries[name] = (artist_id, stored_at)
+
+
+    def save(self):
+        if not self.path:
+            return
+        with self.lock:
+            snapshot = dict(self.entries)
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.path)
+
+
+    def seed_from_dataset(self, dataset):
+        try:
+            artist_df = dataset.read(columns=['artist_id', 'name', 'alternate_names'])
+        except Exception:
+            return
+
+        for artist_id, name, alternate_names in artist_df.itertuples(index=False):
+            names = [name]
+            if alternate_names is not None and not isinstance(alternate_names, str):
+                names.extend(alternate_names)
+            for n in names:
+                if isinstance(n, str) and n:
+                    self.put(n, artist_id, persist=False)
+
+
+    def get(self, name):
+        key = normalize_name(name)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            artist_id, stored_at = entry
+            if self.ttl and time.time() - stored_at > self.ttl:
+                del self.entries[key]
+                return None
+
+            self.entries.move_to_end(key)
+            return artist_id
+
+
+    def put(self, name, artist_id, persist=True):
+        if artist_id is None:
+            return
+        key = normalize_name(name)
+        with self.lock:
+            self.entries[key] = (int(artist_id), time.time())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        if persist:
+            self.save()
+
+
+CachedResponse = namedtuple('CachedResponse', ['body', 'etag', 'last_modified', 'fetched_at'])
+
+
+class ResponseCache():
+    """
+    On-disk cache for API payloads (a ContentStore under cache/).
+    Bodies are stored zlib-compressed and content-addressed (sha256), so identical payloads are kept once.
+    Entries remember ETag / Last-Modified for conditional revalidation; the least recently used
+    entries are evicted once the stored bodies exceed max_bytes.
+    """
+
+    def __init__(self, path=os.path.join(CACHE_DIR, "responses.sqlite"), max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.blobs = ContentStore(path, max_bytes, columns=['etag', 'last_modified', 'fetched_at'])
+
+
+    @staticmethod
+    def make_key(url, params=None):
+        query = json.dumps(sorted((params or {}).items()), default=str)
+        return hashlib.sha256(f"{url}?{query}".encode('utf-8')).hexdigest()
+
+
+    def lookup(self, key):
+        entry = self.blobs.get(key)
+        if entry is None:
+            return None
+
+        body, metadata = entry
+        return CachedResponse(zlib.decompress(body), metadata['etag'], metadata['last_modified'],
+                              metadata['fetched_at'])
+
+
+    def touch(self, key):
+        """Mark an entry as revalidated (the server answered 304 Not Modified)."""
+        self.blobs.update(key, fetched_at=time.time())
+
+
+    def store(self, key, body, etag=None, last_modified=None):
+        self.blobs.put(key, zlib.compress(body), etag=etag, last_modified=last_modified, fetched_at=time.time())
+
+
+    def close(self):
+        self.blobs.close()
+
+
+@st.cache_resource
+def get_artist_id_cache():
+    """Process-wide cache shared by every GeniusClient that isn't given its own."""
+    return ArtistIdCache()
+
+
+@st.cache_resource
+def get_response_cache():
+    """Process-wide response cache shared by every GeniusClient that isn't given its own."""
+    return ResponseCache()
@@ -0,0 +1,273 @@
+import threading
+import numpy as np
+import pandas as pd
+import streamlit as st
+from dataset import ARTIST_DATA, SONG_DATA, CONTRIBUTER_DATA
+
+
+# Songs and artist codes are packed into one int64 key: (high << 32) | low
+CODE_BITS = 32
+CODE_MASK = (1 << CODE_BITS) - 1
+EMPTY = np.array([], dtype=np.int64)
+
+
+def _ranges(starts, ends):
+    """Concatenation of arange(start, end) for each pair, without a Python loop."""
+    lengths = ends - starts
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(starts, lengths) + offsets
+
+
+def _group_pairs(groups, members, is_new=None):
+    """
+    Every unordered pair of members within the same group (rows sorted by group).
+    With is_new, only pairs where at least one side is new are returned.
+    """
+    n = len(members)
+    if n < 2:
+        return EMPTY, EMPTY
+
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    sizes = np.diff(np.r_[starts, n])
+    later = np.repeat(starts + sizes, sizes) - np.arange(n) - 1
+    left = np.repeat(np.arange(n), later)
+    right = left + 1 + np.arange(len(left)) - np.repeat(np.cumsum(later) - later, later)
+
+    if is_new is not None:
+        keep = is_new[left] | is_new[right]
+        left, right = left[keep], right[keep]
+    return members[left], members[right]
+
+
+class CollabGraph():
+    """
+    Artist-to-artist collaboration graph over the whole catalog: two artists are linked when they
+    are credited on the same song (a song's main artist counts as credited), weighted by the number
+    of songs they share.
+
+    Adjacency is held as CSR arrays over dense artist codes, with each artist's neighbors sorted by
+    weight, so neighbors / k_hop / shortest_path are array slices and vectorized BFS steps.
+    New credits are folded in incrementally: only pairs on the songs they touch are computed.
+    Queries refresh from the datasets first, like DataStore.
+    """
+
+    SOURCES = {
+        'contributors': CONTRIBUTER_DATA,
+        'songs': SONG_DATA
+    }
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.versions = None
+        self._reset()
+
+
+    def _reset(self):
+        self.ids = EMPTY
+        self.id_index = pd.Index(EMPTY)
+        self.names = np.array([], dtype=object)
+        self.credit_keys = EMPTY   # sorted song_id << 32 | artist code, one per artist per song
+        self.edge_keys = EMPTY     # sorted a << 32 | b with a < b
+        self.edge_weights = EMPTY
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.neighbor_codes = EMPTY
+        self.neighbor_weights = EMPTY
+
+
+    def _codes(self, artist_ids, names):
+        """Dense codes for artist ids, registering unseen artists."""
+        codes = self.id_index.get_indexer(artist_ids)
+        missing = codes < 0
+        if missing.any():
+            new_ids, first = np.unique(artist_ids[missing], return_index=True)
+            self.ids = np.concatenate([self.ids, new_ids])
+            self.names = np.concatenate([self.names, names[missing][first]])
+            self.id_index = pd.Index(self.ids)
+            codes = self.id_index.get_indexer(artist_ids)
+        return codes.astype(np.int64)
+
+
+    def add_credits(self, credits):
+        """
+        Fold credit rows (song_id, artist_id, artist_name) into the graph.
+        Returns the number of new (song, artist) credits.
+        """
+        credits = credits.dropna(subset=['song_id', 'artist_id'])
+        if credits.empty:
+            return 0
+
+        with self.lock:
+            codes = self._codes(
+                credits['artist_id'].to_numpy(dtype=np.int64),
+                credits['artist_name'].to_numpy(dtype=object)
+            )
+            keys = np.unique((credits['song_id'].to_numpy(dtype=np.int64) << CODE_BITS) | codes)
+            keys = keys[~np.isin(keys, self.credit_keys, assume_unique=True)]
+            if len(keys) == 0:
+                return 0
+
+            # Existing credits on the songs being extended; only pairs involving a new credit are added
+            songs = np.unique(keys >> CODE_BITS)
+            old = self.credit_keys[_ranges(
+                np.searchsorted(self.credit_keys, songs << CODE_BITS),
+                np.searchsorted(self.credit_keys, (songs + 1) << CODE_BITS)
+            )]
+            combined = np.concatenate([old, keys])
+            is_new = np.r_[np.zeros(len(old), dtype=bool), np.ones(len(keys), dtype=bool)]
+            order = np.argsort(combined, kind='stable')
+            combined, is_new = combined[order], is_new[order]
+
+            left, right = _group_pairs(combined >> CODE_BITS, combined & CODE_MASK, is_new)
+            pair_keys = (np.minimum(left, right) << CODE_BITS) | np.maximum(left, right)
+
+            self.credit_keys = np.sort(np.concatenate([self.credit_keys, keys]))
+            self._merge_edges(pair_keys)
+            return len(keys)
+
+
+    def _merge_edges(self, pair_keys):
+        """Add one shared song to each pair and rebuild the CSR adjacency."""
+        keys, inverse = np.unique(np.concatenate([self.edge_keys, pair_keys]), return_inverse=True)
+        weights = np.concatenate([self.edge_weights, np.ones(len(pair_keys), dtype=np.int64)])
+        self.edge_keys = keys
+        self.edge_weights = np.bincount(inverse, weights=weights, minlength=len(keys)).astype(np.int64)
+
+        a, b = self.edge_keys >> CODE_BITS, self.edge_keys & CODE_MASK
+        src, dst = np.concatenate([a, b]), np.concatenate([b, a])
+        weights = np.concatenate([self.edge_weights, self.edge_weights])
+
+        order = np.lexsort((-weights, src))
+        self.neighbor_codes = dst[order]
+        self.neighbor_weights = weights[order]
+        self.indptr = np.r_[0, np.cumsum(np.bincount(src, minlength=len(self.ids)))].astype(np.int64)
+
+
+    def _song_credits(self, songs):
+        """Main-artist credits for song rows, named from the artist table."""
+        names = ARTIST_DATA.read(columns=['artist_id', 'name']).drop_duplicates('artist_id', keep='last')
+        credits = songs[['song_id', 'artist_id']].dropna()
+        credits['artist_name'] = credits['artist_id'].map(names.set_index('artist_id')['name'])
+        return credits
+
+
+    def refresh(self):
+        """Catch up with the datasets: new fragments are added incrementally, anything else rebuilds."""
+        with self.lock:
+            versions = {name: dataset.version for name, dataset in self.SOURCES.items()}
+            if versions == self.versions:
+                return
+
+            deltas = None
+            if self.versions is not None:
+                deltas = {
+                    'contributors': CONTRIBUTER_DATA.read_since(
+                        self.versions['contributors'], columns=['song_id', 'artist_id', 'artist_name']
+                    ),
+                    'songs': SONG_DATA.read_since(self.versions['songs'], columns=['song_id', 'artist_id'])
+                }
+
+            if deltas is None or any(delta is None for delta in deltas.values()):
+                self._reset()
+                deltas = {
+                    'contributors': CONTRIBUTER_DATA.read(columns=['song_id', 'artist_id', 'artist_name']),
+                    'songs': SONG_DATA.read(columns=['song_id', 'artist_id'])
+                }
+
+            credits = [deltas['contributors']]
+            if len(deltas['songs']) > 0:
+                credits.append(self._song_credits(deltas['songs']))
+            self.add_credits(pd.concat(credits, ignore_index=True))
+            self.versions = versions
+
+
+    def _code(self, artist_id):
+        code = self.id_index.get_indexer([int(artist_id)])[0]
+        return None if code < 0 else code
+
+
+    def _frame(self, codes, **columns):
+        return pd.DataFrame({'artist_id': self.ids[codes], 'name': self.names[codes], **columns})
+
+
+    def neighbors(self, artist_id, top_n=None):
+        """Direct collaborators by shared songs, heaviest first."""
+        with self.lock:
+            self.refresh()
+            code = self._code(artist_id)
+            if code is None:
+                return self._frame(EMPTY, weight=EMPTY)
+
+            start, end = self.indptr[code], self.indptr[code + 1]
+            if top_n is not None:
+                end = min(end, start + top_n)
+            return self._frame(self.neighbor_codes[start:end], weight=self.neighbor_weights[start:end])
+
+
+    def k_hop(self, artist_id, k=2, max_nodes=None):
+        """Artists within k collaboration hops (excluding the artist), with their distance."""
+        with self.lock:
+            self.refresh()
+            code = self._code(artist_id)
+            if code is None:
+                return self._frame(EMPTY, hops=EMPTY)
+
+            visited = np.zeros(len(self.ids), dtype=bool)
+            visited[code] = True
+            frontier = np.array([code], dtype=np.int64)
+            found, hops = [], []
+
+            for hop in range(1, k + 1):
+                reached = self.neighbor_codes[_ranges(self.indptr[frontier], self.indptr[frontier + 1])]
+                frontier = np.unique(reached[~visited[reached]])
+                if len(frontier) == 0:
+                    break
+                visited[frontier] = True
+                found.append(frontier)
+                hops.append(np.full(len(frontier), hop))
+                if max_nodes is not None and sum(len(f) for f in found) >= max_nodes:
+                    break
+
+            codes = np.concatenate(found) if found else EMPTY
+            hops = np.concatenate(hops) if hops else EMPTY
+            if max_nodes is not None:
+                codes, hops = codes[:max_nodes], hops[:max_nodes]
+            return self._frame(codes, hops=hops)
+
+
+    def shortest_path(self, source_id, target_id, max_hops=6):
+        """Fewest-hop collaboration chain from source to target as a DataFrame, or None if there is none."""
+        with self.lock:
+            self.refresh()
+            source, target = self._code(source_id), self._code(target_id)
+            if source is None or target is None:
+                return None
+
+            parent = np.full(len(self.ids), -1, dtype=np.int64)
+            parent[source] = source
+            frontier = np.array([source], dtype=np.int64)
+
+            for _ in range(max_hops):
+                if parent[target] >= 0:
+                    break
+                starts, ends = self.indptr[frontier], self.indptr[frontier + 1]
+                reached = self.neighbor_codes[_ranges(starts, ends)]
+                via = np.repeat(frontier, ends - starts)
+
+                new = parent[reached] < 0
+                frontier, first = np.unique(reached[new], return_index=True)
+                if len(frontier) == 0:
+                    break
+                parent[frontier] = via[new][first]
+
+            if parent[target] < 0:
+                return None
+
+            path = [target]
+            while path[-1] != source:
+                path.append(parent[path[-1]])
+            return self._frame(np.array(path[::-1], dtype=np.int64))
+
+
+@st.cache_resource
+def get_collab_graph():
+    return CollabGraph()
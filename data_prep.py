@@ -1,13 +1,20 @@
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import data_update as du
 
 
 # --- Genius Data Preparation ---
 
-def prep_artist_song_data(client, artist, include_song_data=False, update_artist_song_data=True):
-    artist_id = client.get_artist_id(artist)
-    artist_song_json = client.get_artist_songs(artist, num_returned=50, page=1)['response']['songs']
-    artist_song_df = pd.DataFrame(artist_song_json)
+def prep_artist_song_data(client, artist, include_song_data=False, update_artist_song_data=True, artist_id=None):
+    if artist_id is None:
+        artist_id = client.get_artist_id(artist)
+
+    # Frames are built per page while the client prefetches the next one
+    page_frames = [
+        pd.DataFrame(songs)
+        for songs in client.iter_artist_songs(artist_id, num_returned=50, page=1)
+    ]
+    artist_song_df = pd.concat(page_frames, ignore_index=True)
 
     artist_song_df = artist_song_df.rename(columns={'id': 'song_id'})
     artist_song_df['artist_id'] = artist_id
@@ -39,22 +46,16 @@ def prep_artist_song_data(client, artist, include_song_data=False, update_artist
     if update_artist_song_data == True:
         du.update_artist_song_data(artist_song_df[columns])
     
-    song_data = []
-    
     if include_song_data == True:
-        for song_id in artist_song_df['song_id']:
-            song_data_df = prep_song_data(client, song_id)
-            song_data.append(song_data_df)
-
-        song_features_df = pd.concat(song_data, ignore_index=True)
+        song_features_df, _ = enrich_songs(client, artist_song_df['song_id'].tolist())
 
         return artist_song_df[columns], song_features_df
     
     return artist_song_df[columns]
 
 
-def prep_artist_data(client, artist, include_artist_song_data=False, include_song_data=False, update_artist_data=True):
-    artist_json = client.get_artist_data(artist)['response']['artist']
+def prep_artist_data(client, artist, include_artist_song_data=False, include_song_data=False, update_artist_data=True, artist_id=None):
+    artist_json = client.get_artist_data(artist, artist_id=artist_id)['response']['artist']
     artist_df = pd.DataFrame([artist_json])
 
     artist_df = artist_df.rename(columns={'id': 'artist_id'})
@@ -70,98 +71,115 @@ def prep_artist_data(client, artist, include_artist_song_data=False, include_son
     return artist_df
 
 
-def prep_song_data(client, song_id):
-    song_json = client.get_song_data(song_id)['response']['song']
-    song_df = pd.DataFrame([song_json])
-    song_df = song_df.rename(columns={'id': 'song_id'})
-    
-    # Description
-    song_df['description'] = song_df['description'].apply(lambda x: x['plain'])
+SONG_FEATURE_COLUMNS = ['song_id', 'title', 'description', 'primary_artist_id', 'primary_artist_names', 'language', 'recording_location', 'release_date', 'hot', 'pageviews', 'song_art_primary_color', 'song_art_secondary_color', 'album_id', 'album_title', 'album_cover_art_url']
 
-    # Artist
-    song_df['primary_artist_id'] = client.get_artist_id(song_df['primary_artist_names'][0])
+CONTRIBUTER_COLUMNS = ['song_id', 'artist_id', 'artist_name', 'label']
 
-    # Stat Dictionary
-    stats = pd.json_normalize(song_df['stats'])
-    song_df['hot'] = stats['hot']
-    try:
-        song_df['pageviews'] = stats['pageviews']
-    except:
-        song_df['pageviews'] = 0
 
-    # Album Dictionary
-    album = pd.json_normalize(song_df['album'])
+def parse_song_features(song_json):
+    """Song-feature row from a /songs/{id} payload."""
+    stats = song_json.get('stats') or {}
+    album = song_json.get('album')
+    description = song_json.get('description')
 
-    try: 
-        song_df['album_id'] = album['id']
-        song_df['album_title'] = album['name']
-        song_df['album_cover_art_url'] = album['cover_art_url']
-    except:
-        song_df['album_id'] = "None"
-        song_df['album_title'] = "None"
-        song_df['album_cover_art_url'] = "None"
+    return {
+        'song_id': song_json['id'],
+        'title': song_json.get('title'),
+        'description': description['plain'] if isinstance(description, dict) else description,
+        'primary_artist_id': song_json['primary_artist']['id'],
+        'primary_artist_names': song_json.get('primary_artist_names'),
+        'language': song_json.get('language'),
+        'recording_location': song_json.get('recording_location'),
+        'release_date': song_json.get('release_date'),
+        'hot': stats.get('hot'),
+        'pageviews': stats.get('pageviews', 0),
+        'song_art_primary_color': song_json.get('song_art_primary_color'),
+        'song_art_secondary_color': song_json.get('song_art_secondary_color'),
+        'album_id': album['id'] if album else "None",
+        'album_title': album['name'] if album else "None",
+        'album_cover_art_url': album['cover_art_url'] if album else "None"
+    }
 
 
-    # Collaborator Dictionary
-    colab = pd.json_normalize(song_df['custom_performances'])
-    
-    exploded = song_df.explode('custom_performances')
-    normalized = pd.json_normalize(exploded['custom_performances'])
+def parse_contributers(song_json):
+    """Contributor rows (custom performances, writers, producers) from a /songs/{id} payload."""
+    song_id = song_json['id']
+    rows = []
 
-    print(normalized.columns)
+    for performance in song_json.get('custom_performances') or []:
+        for artist in performance.get('artists') or []:
+            rows.append((song_id, artist.get('id'), artist.get('name'), performance.get('label')))
 
-    columns = ['song_id', 'title', 'description', 'primary_artist_id', 'primary_artist_names', 'language', 'recording_location', 'release_date', 'hot', 'pageviews', 'song_art_primary_color', 'song_art_secondary_color', 'album_id', 'album_title', 'album_cover_art_url']
+    for label, key in (('Writer', 'writer_artists'), ('Producer', 'producer_artists')):
+        for artist in song_json.get(key) or []:
+            rows.append((song_id, artist.get('id'), artist.get('name'), label))
 
-    return song_df[columns]
+    return rows
 
 
-def prep_contributer_data(client, song_id):
+def prep_song_data(client, song_id):
     song_json = client.get_song_data(song_id)['response']['song']
-    song_df = pd.DataFrame([song_json])
-    song_df = song_df.rename(columns={'id': 'song_id'})
+    primary_artist = song_json['primary_artist']
+    client.artist_ids.put(primary_artist['name'], primary_artist['id'], persist=False)
 
-    tmp = song_df[['custom_performances']].explode('custom_performances')
-    perf_df = pd.json_normalize(tmp['custom_performances'])
-    perf_df = perf_df.explode('artists')
-    artist_df = pd.json_normalize(perf_df['artists'])
+    return pd.DataFrame([parse_song_features(song_json)], columns=SONG_FEATURE_COLUMNS)
 
-    result_df = pd.DataFrame({
-        'label': perf_df['label'].values,
-        'artist_id': artist_df['id'].values,
-        'artist_name': artist_df['name'].values
-    })
 
-    rows = []
-
-    for artists in song_df['writer_artists']:
-        for artist in artists:
-            rows.append({
-                'label': 'Writer',
-                'artist_id': artist.get('id'),
-                'artist_name': artist.get('name')
-            })
-
-    writer_df = pd.DataFrame(rows)
-
-    rows = []
-
-    for artists in song_df['producer_artists']:
-        for artist in artists:
-            rows.append({
-                'label': 'Producer',
-                'artist_id': artist.get('id'),
-                'artist_name': artist.get('name')
-            })
-
-    producer_df = pd.DataFrame(rows)
-
-    final_df = pd.concat([result_df, writer_df, producer_df], ignore_index=True)
-    final_df['song_id'] = song_id
-
-    return final_df[['song_id', 'artist_id', 'artist_name', 'label']]
+def prep_contributer_data(client, song_id):
+    song_json = client.get_song_data(song_id)['response']['song']
+    return pd.DataFrame(parse_contributers(song_json), columns=CONTRIBUTER_COLUMNS)
 
 
+def _fetch_song(client, song_id):
+    song_json = client.get_song_data(song_id)['response']['song']
+    primary_artist = song_json['primary_artist']
+    client.artist_ids.put(primary_artist['name'], primary_artist['id'], persist=False)
 
+    return parse_song_features(song_json), parse_contributers(song_json)
 
 
+def iter_song_enrichment(client, song_ids, max_workers=8):
+    """
+    Fetch each song once, concurrently, and parse both its feature row and its contributor rows.
+    Yields (song_id, feature_row, contributor_rows) in completion order; both are None if the song failed.
+    """
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    futures = {pool.submit(_fetch_song, client, song_id): song_id for song_id in song_ids}
 
+    try:
+        for future in as_completed(futures):
+            song_id = futures[future]
+            try:
+                feature_row, contributor_rows = future.result()
+            except Exception:
+                feature_row, contributor_rows = None, None
+            yield song_id, feature_row, contributor_rows
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def enrich_songs(client, song_ids, max_workers=8, on_progress=None):
+    """
+    Batch enrichment over a list of song IDs.
+    Returns (song_features_df, contributor_df), both built column-wise in a single pass.
+    on_progress(done, total) is called as each song finishes.
+    """
+    features = {c: [] for c in SONG_FEATURE_COLUMNS}
+    contributers = []
+    total = len(song_ids)
+
+    for done, (song_id, feature_row, contributor_rows) in enumerate(
+        iter_song_enrichment(client, song_ids, max_workers=max_workers), start=1
+    ):
+        if feature_row is not None:
+            for c in SONG_FEATURE_COLUMNS:
+                features[c].append(feature_row[c])
+            contributers.extend(contributor_rows)
+
+        if on_progress is not None:
+            on_progress(done, total)
+
+    song_features_df = pd.DataFrame(features, columns=SONG_FEATURE_COLUMNS)
+    contributor_df = pd.DataFrame.from_records(contributers, columns=CONTRIBUTER_COLUMNS)
+
+    return song_features_df, contributor_df
@@ -0,0 +1,360 @@
+import hashlib
+import threading
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+import streamlit as st
+from dataset import ARTIST_DATA, SONG_DATA, CONTRIBUTER_DATA
+from search_index import TrigramIndex
+from caching import LRUCache
+
+
+EMPTY_POSITIONS = np.array([], dtype=np.intp)
+
+# In-memory dtypes: nullable ints for ids, categoricals for the heavily repeated strings
+SCHEMAS = {
+    'artists': {'artist_id': 'Int64', 'followers_count': 'Int64'},
+    'songs': {'song_id': 'Int64', 'artist_id': 'Int64', 'album_id': 'Int64'},
+    'contributors': {'song_id': 'Int64', 'artist_id': 'Int64', 'artist_name': 'category', 'label': 'category'}
+}
+
+# Wide JSON/text song columns the dashboard doesn't display; read on demand through song_details()
+SONG_DETAIL_COLUMNS = ['description', 'stats', 'primary_artist', 'featured_artists', 'release_date_components']
+
+# Inputs of the discography grid cards (see DataStore.artist_song_cards)
+SONG_CARD_COLUMNS = ['song_id', 'title', 'release_date', 'pageviews', 'album_cover_art_url', 'song_art_image_thumbnail_url']
+
+
+def compact_frame(df, schema):
+    for col, dtype in schema.items():
+        if col not in df.columns:
+            continue
+        if dtype == 'category':
+            df[col] = df[col].astype('category')
+        else:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(dtype)
+    return df
+
+
+def concat_compact(frame, delta, schema):
+    """Append delta to frame, keeping categoricals categorical (plain concat would fall back to object)."""
+    delta = compact_frame(delta, schema)
+    combined = pd.concat([frame, delta], ignore_index=True)
+    for col, dtype in schema.items():
+        if dtype == 'category' and col in frame.columns and col in delta.columns:
+            combined[col] = union_categoricals([frame[col], delta[col]], ignore_order=True)
+    return combined
+
+
+def index_texts(index, frame, key_col, text_cols):
+    """
+    Add (key, text) pairs of frame to a search index; list columns (alternate_names) add every item.
+    The first text column holds the primary texts (e.g. an artist's name), preferred by exact lookups.
+    """
+    for i, col in enumerate(text_cols):
+        if col not in frame.columns:
+            continue
+        pairs = pd.DataFrame({'key': frame[key_col].to_numpy(), 'text': frame[col].to_numpy()})
+        pairs = pairs.explode('text').dropna().drop_duplicates()
+        index.add_many(pairs['key'].tolist(), pairs['text'].tolist(), primary=(i == 0))
+
+
+def decode_categoricals(df):
+    """Plain string columns again, for the small per-artist slices handed to the pages."""
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(df[col].cat.categories.dtype)
+    return df
+
+
+class DataStore():
+    """
+    Process-wide, read-only copies of the three tables, shared by every session.
+    A table is refreshed the next time it is accessed after data_update wrote to it
+    (its dataset version changed). Callers must not modify the returned frames.
+
+    Only the columns in COLUMNS are resident, held compactly (see SCHEMAS); anything else a page
+    asks for is read per artist with projection and filter pushdown. memory_report() shows the footprint.
+    Each table keeps a positional index (artist_id -> song rows, song_id -> contributor rows)
+    built at load and extended when only new rows were appended, so per-artist lookups
+    don't scan the tables.
+    """
+
+    DATASETS = {
+        'artists': ARTIST_DATA,
+        'songs': SONG_DATA,
+        'contributors': CONTRIBUTER_DATA
+    }
+
+    # Resident columns, the union of what the pages declare (and SONG_CARD_COLUMNS); None loads the whole table
+    COLUMNS = {
+        'artists': None,
+        'songs': ['song_id', 'artist_id', 'title', 'release_date', 'pageviews', 'album_cover_art_url',
+                  'song_art_image_thumbnail_url'],
+        'contributors': ['song_id', 'artist_id', 'artist_name', 'label']
+    }
+
+    INDEX_COLUMNS = {
+        'artists': 'artist_id',
+        'songs': 'artist_id',
+        'contributors': 'song_id'
+    }
+
+    # Text search indexes: field -> (table, key column, text columns)
+    SEARCH_FIELDS = {
+        'artist_names': ('artists', 'artist_id', ['name', 'alternate_names']),
+        'song_titles': ('songs', 'song_id', ['title']),
+        'contributor_names': ('contributors', 'artist_name', ['artist_name'])
+    }
+
+    def __init__(self, max_cached_reads=64):
+        self.lock = threading.RLock()
+        self.frames = {}
+        self.versions = {}
+        self.indexes = {}
+        self.artist_credit_positions = {}
+        self.search_indexes = {}
+        self.read_cache = LRUCache(max_cached_reads)
+
+
+    def _refresh(self, name):
+        dataset = self.DATASETS[name]
+        version = dataset.version
+        if self.versions.get(name) == version:
+            return
+
+        delta = None
+        if name in self.frames:
+            delta = dataset.read_since(self.versions[name], columns=self.COLUMNS[name])
+
+        if delta is None:
+            frame = compact_frame(dataset.read(columns=self.COLUMNS[name]), SCHEMAS[name])
+            self.frames[name] = frame
+            self.indexes[name] = frame.groupby(self.INDEX_COLUMNS[name], sort=False).indices
+            self.artist_credit_positions.clear()
+            for field, (table, _, _) in self.SEARCH_FIELDS.items():
+                if table == name:
+                    self.search_indexes.pop(field, None)
+        elif len(delta) > 0:
+            self._extend(name, delta)
+
+        self.versions[name] = version
+
+
+    def _extend(self, name, delta):
+        """Append rows to a loaded table and fold their positions into its index."""
+        offset = len(self.frames[name])
+        self.frames[name] = concat_compact(self.frames[name], delta, SCHEMAS[name])
+
+        index = self.indexes[name]
+        for key, positions in delta.groupby(self.INDEX_COLUMNS[name], sort=False).indices.items():
+            positions = positions + offset
+            index[key] = np.concatenate([index[key], positions]) if key in index else positions
+
+        for field, (table, key_col, text_cols) in self.SEARCH_FIELDS.items():
+            if table == name and field in self.search_indexes:
+                index_texts(self.search_indexes[field], delta, key_col, text_cols)
+
+        # Cached per-artist credit positions are stale for the artists whose songs changed
+        if name == 'songs':
+            for artist_id in delta['artist_id'].dropna().unique():
+                self.artist_credit_positions.pop(artist_id, None)
+        elif name == 'contributors':
+            self.artist_credit_positions.clear()
+
+
+    def table(self, name):
+        with self.lock:
+            self._refresh(name)
+            return self.frames[name]
+
+
+    def _positions(self, name, key):
+        with self.lock:
+            self._refresh(name)
+            return self.frames[name], self.indexes[name].get(key, EMPTY_POSITIONS)
+
+
+    @property
+    def artists(self):
+        return self.table('artists')
+
+
+    @property
+    def songs(self):
+        return self.table('songs')
+
+
+    @property
+    def contributors(self):
+        return self.table('contributors')
+
+
+    def artist(self, artist_id):
+        frame, positions = self._positions('artists', artist_id)
+        return frame.take(positions)
+
+
+    def artist_signature(self, artist_id):
+        """
+        Content hash of an artist's resident song and contributor rows, cached per data version.
+        Changes when rows are added or removed and when values are updated in place, but not when
+        the rows are only reordered (compaction re-sorts the base without bumping the version).
+        """
+        artist_id = int(artist_id)
+
+        def compute():
+            digest = hashlib.sha256()
+            for frame in (self.artist_songs(artist_id), self.artist_contributors(artist_id)):
+                digest.update(np.sort(pd.util.hash_pandas_object(frame, index=False).to_numpy()).tobytes())
+            return digest.hexdigest()
+
+        return self._cached(('signature', artist_id, SONG_DATA.version, CONTRIBUTER_DATA.version), compute)
+
+
+    def artist_songs(self, artist_id, columns=None):
+        """
+        One artist's songs. Resident columns come from the in-memory index; other columns are read
+        from parquet for this artist only (projection + artist_id pushdown), cached per data version.
+        """
+        if columns is None or set(columns) <= set(self.COLUMNS['songs']):
+            frame, positions = self._positions('songs', artist_id)
+            songs = frame.take(positions)
+            return songs if columns is None else songs[list(columns)]
+
+        artist_id = int(artist_id)
+
+        def read():
+            songs = SONG_DATA.read(
+                columns=list(dict.fromkeys(['artist_id'] + list(columns))),
+                filters=[('artist_id', '==', artist_id)],
+                partition=artist_id
+            )
+            return compact_frame(songs, SCHEMAS['songs'])[list(columns)]
+
+        return self._cached((artist_id, tuple(columns), SONG_DATA.version), read)
+
+
+    def _cached(self, key, compute):
+        """Per-artist derived frames, kept in a small LRU; keys include the data version."""
+        return self.read_cache.get_or_compute(key, compute)
+
+
+    def artist_song_cards(self, artist_id):
+        """
+        One artist's songs with the display fields of the discography grid precomputed (thumbnail URL,
+        parsed date, formatted date and views), once per data version rather than per card on each rerun.
+        """
+        def build():
+            cards = self.artist_songs(artist_id, columns=SONG_CARD_COLUMNS).reset_index(drop=True)
+            raw_dates = cards['release_date']
+            cards['release_date'] = pd.to_datetime(raw_dates, errors='coerce')
+            cards['image_url'] = cards['song_art_image_thumbnail_url'].fillna(cards['album_cover_art_url'])
+            # Dates pandas can't parse are shown as stored
+            cards['release_label'] = cards['release_date'].dt.strftime('%B %d, %Y').fillna(raw_dates.astype('object'))
+            cards['views_label'] = [f"{int(views):,}" if pd.notna(views) else None for views in cards['pageviews']]
+            return cards
+
+        return self._cached(('cards', artist_id, SONG_DATA.version), build)
+
+
+    def artist_contributors_positions(self, artist_id):
+        """Row offsets of one artist's credits in the contributors table, via song_id -> contributor rows."""
+        with self.lock:
+            self._refresh('songs')
+            self._refresh('contributors')
+
+            positions = self.artist_credit_positions.get(artist_id)
+            if positions is None:
+                song_positions = self.indexes['songs'].get(artist_id, EMPTY_POSITIONS)
+                song_ids = self.frames['songs']['song_id'].to_numpy()[song_positions]
+                credit_index = self.indexes['contributors']
+                chunks = [credit_index[song_id] for song_id in song_ids if song_id in credit_index]
+                positions = np.unique(np.concatenate(chunks)) if chunks else EMPTY_POSITIONS
+                self.artist_credit_positions[artist_id] = positions
+            return positions
+
+
+    def artist_contributors(self, artist_id):
+        """Contributor rows for one artist's songs."""
+        with self.lock:
+            positions = self.artist_contributors_positions(artist_id)
+            contributors = self.frames['contributors']
+
+        return decode_categoricals(contributors.take(positions))
+
+
+    def song_details(self, song_ids, columns=None):
+        """Wide song columns (description, stats, ...) read on demand for the given songs only."""
+        columns = columns or SONG_DETAIL_COLUMNS
+        song_ids = [int(song_id) for song_id in song_ids]
+        return SONG_DATA.read(
+            columns=['song_id'] + [c for c in columns if c != 'song_id'],
+            filters=[('song_id', 'in', song_ids)]
+        )
+
+
+    def search_index(self, field):
+        """
+        Trigram index over one SEARCH_FIELDS field, built on first use from the resident table and
+        extended with new rows as they are ingested (rebuilt after a full reload).
+        """
+        with self.lock:
+            table, key_col, text_cols = self.SEARCH_FIELDS[field]
+            self._refresh(table)
+            if field not in self.search_indexes:
+                index = TrigramIndex()
+                index_texts(index, self.frames[table], key_col, text_cols)
+                self.search_indexes[field] = index
+            return self.search_indexes[field]
+
+
+    def search(self, field, query, limit=None, fuzzy=False):
+        """Keys (artist_id / song_id / contributor name) matching query, best first."""
+        index = self.search_index(field)
+        with self.lock:
+            return index.search(query, limit=limit, fuzzy=fuzzy)
+
+
+    def matches(self, field, query):
+        """Set of keys whose text contains query (case- and accent-insensitive)."""
+        index = self.search_index(field)
+        with self.lock:
+            return index.matches(query)
+
+
+    def find_artist_id(self, name):
+        """
+        Artist id whose name or one of its alternate names equals name (normalized), else None.
+        A primary name wins over another artist's alternate name.
+        """
+        index = self.search_index('artist_names')
+        with self.lock:
+            return index.lookup(name)
+
+
+    def memory_report(self):
+        """Resident size per loaded table (deep, i.e. including string payloads)."""
+        rows = []
+        with self.lock:
+            tables = dict(self.frames)
+
+        for name, frame in tables.items():
+            rows.append({
+                'table': name,
+                'rows': len(frame),
+                'columns': frame.shape[1],
+                'memory_mb': round(frame.memory_usage(deep=True).sum() / 1024 ** 2, 2)
+            })
+        return pd.DataFrame(rows, columns=['table', 'rows', 'columns', 'memory_mb'])
+
+
+    @property
+    def version(self):
+        """Combined data version, for keying caches built on top of the store."""
+        return tuple(dataset.version for dataset in self.DATASETS.values())
+
+
+@st.cache_resource
+def get_data_store():
+    return DataStore()
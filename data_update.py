@@ -1,89 +1,124 @@
 import json
+import os
+import queue
+import threading
 import pandas as pd
+from dataset import ARTIST_DATA, SONG_DATA, CONTRIBUTER_DATA
+
+
+_csv_queue = queue.Queue()
+_csv_worker = None
+_csv_worker_lock = threading.Lock()
+# csv_path -> dataset version a full export was taken at; queued deltas up to it are already in the file
+_csv_full_exports = {}
+
+
+def csv_export_enabled():
+    """CSV copies are opt-in: set CSV_EXPORT=1 (e.g. in .env) to keep them."""
+    return os.getenv("CSV_EXPORT", "").strip().lower() in ("1", "true", "yes")
+
+
+def append_csv(csv_path, new_df, dataset=None, version=None):
+    """
+    Append only the new rows to the human-readable CSV copy. A missing copy is first written
+    in full from the dataset, so it mirrors the whole table and not just the rows added since.
+    """
+    if dataset is not None and not os.path.exists(csv_path):
+        with dataset.lock:
+            _csv_full_exports[csv_path] = dataset.version
+            full_df = dataset.read()
+        full_df.to_csv(csv_path, index=False, sep=";")
+
+    if version is not None and version <= _csv_full_exports.get(csv_path, -1):
+        return
+
+    if os.path.exists(csv_path):
+        header = pd.read_csv(csv_path, sep=";", nrows=0).columns
+        new_df.reindex(columns=header).to_csv(csv_path, index=False, sep=";", mode="a", header=False)
+    else:
+        new_df.to_csv(csv_path, index=False, sep=";")
+
+
+def _csv_export_loop():
+    while True:
+        csv_path, new_df, dataset, version = _csv_queue.get()
+        try:
+            append_csv(csv_path, new_df, dataset, version)
+        except Exception as e:
+            print(f"CSV export to {csv_path} failed: {e}")
+        finally:
+            _csv_queue.task_done()
+
+
+def export_csv(csv_path, new_df, dataset=None):
+    """
+    Queue the delta rows for the CSV copy. A single background worker writes them,
+    in order, so the caller never waits on CSV I/O (including the one-time full export
+    when the copy doesn't exist yet).
+    """
+    global _csv_worker
+
+    if not csv_export_enabled() or new_df.empty:
+        return
+
+    with _csv_worker_lock:
+        if _csv_worker is None:
+            _csv_worker = threading.Thread(target=_csv_export_loop, name="csv-export", daemon=True)
+            _csv_worker.start()
+
+    version = dataset.version if dataset is not None else None
+    _csv_queue.put((csv_path, new_df.copy(), dataset, version))
+
+
+def wait_for_csv_exports():
+    """Block until all queued CSV exports are written (for scripts that exit right after an update)."""
+    _csv_queue.join()
+
 
 def update_artist_data(new_artist_df):
-    parquet_path = "data/artist_data.parquet"
     csv_path = "data/artist_data.csv"
 
-    existing_df = pd.read_parquet(parquet_path)
-    
-    if new_artist_df['artist_id'].isin(existing_df['artist_id']).any():
+    new_rows = ARTIST_DATA.upsert(new_artist_df.dropna(subset=["artist_id"]))
+    if new_rows.empty:
         print("Artist already in data")
-        return existing_df
-    
-    combined_df = pd.concat([existing_df, new_artist_df], ignore_index=True)
+        return new_rows
 
-    combined_df.to_parquet(parquet_path, index=False)
-    combined_df.to_csv(csv_path, index=False, sep=";")
+    export_csv(csv_path, new_rows, ARTIST_DATA)
 
-    return combined_df.dropna(subset=["artist_id"])
+    return new_rows
 
 
-def update_artist_song_data(new_artist_song_df):  
-    parquet_path = "data/song_data.parquet"
+def update_artist_song_data(new_artist_song_df):
     csv_path = "data/song_data.csv"
 
-    existing_df = pd.read_parquet(parquet_path)
-    
     problematic_cols = ['release_date_components', 'stats', 'featured_artists', 'primary_artist']
     new_artist_song_df = new_artist_song_df.copy()
-    
+
     for col in problematic_cols:
         if col in new_artist_song_df.columns:
             new_artist_song_df[col] = new_artist_song_df[col].apply(
                 lambda x: json.dumps(x) if isinstance(x, (dict, list)) else None
             )
-    
-    for col in problematic_cols:
-        if col in existing_df.columns:
-            existing_df[col] = existing_df[col].apply(
-                lambda x: json.dumps(x) if isinstance(x, (dict, list)) 
-                         else x if isinstance(x, str) 
-                         else None
-            )
 
-    new_rows = new_artist_song_df[~new_artist_song_df['song_id'].isin(existing_df['song_id'])]
+    new_rows = SONG_DATA.upsert(new_artist_song_df)
     if new_rows.empty:
         print("No new songs to add")
-        return existing_df
-
-    combined_df = pd.concat([existing_df, new_rows], ignore_index=True)
-    combined_df.to_parquet(parquet_path, index=False)
-    combined_df.to_csv(csv_path, index=False, sep=";")
-
-    return combined_df
+        return new_rows
 
+    export_csv(csv_path, new_rows, SONG_DATA)
 
-def update_artist_song_data_old(new_artist_song_df):
-    parquet_path = "data/song_data.parquet"
-    csv_path = "data/song_data.csv"
-
-    existing_df = pd.read_parquet(parquet_path)
-
-    new_rows = new_artist_song_df[~new_artist_song_df['song_id'].isin(existing_df['song_id'])]
-    if new_rows.empty:
-        print("No new songs to add")
-        return existing_df
-
-    combined_df = pd.concat([existing_df, new_rows], ignore_index=True)
-    combined_df.to_parquet(parquet_path, index=False)
-    combined_df.to_csv(csv_path, index=False, sep=";")
+    return new_rows
 
-    return combined_df
 
-def update_contributer_data(new_cont_df):
-    parquet_path = "data/contributer_data.parquet"
+def update_contributer_data(new_cont_df, artist_id=None):
     csv_path = "data/contributer_data.csv"
 
-    existing_df = pd.read_parquet(parquet_path)
-
-    new_rows = new_cont_df[~new_cont_df['song_id'].isin(existing_df['song_id'])]
+    # Merged per (song_id, artist_id, label), so a partial re-fetch fills in missing credits
+    new_rows = CONTRIBUTER_DATA.upsert(new_cont_df, partition=artist_id)
     if new_rows.empty:
-        print("No new songs to add")
-        return existing_df
+        print("No new contributors to add")
+        return new_rows
 
-    combined_df = pd.concat([existing_df, new_rows], ignore_index=True)
-    combined_df.to_parquet(parquet_path, index=False)
-    combined_df.to_csv(csv_path, index=False, sep=";")
+    export_csv(csv_path, new_rows, CONTRIBUTER_DATA)
 
-    return combined_df
\ No newline at end of file
+    return new_rows
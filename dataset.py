@@ -0,0 +1,374 @@
+import copy
+import json
+import os
+import threading
+import time
+import uuid
+
+import pandas as pd
+import pyarrow.parquet as pq
+from pandas.api.types import is_bool_dtype, is_numeric_dtype
+
+
+DATA_DIR = "data"
+ROW_GROUP_SIZE = 4096
+
+
+def row_hashes(df):
+    """
+    Content hash per row, stable across the dtype drift between base and fragments
+    (int vs float ids, dicts vs JSON strings).
+    """
+    normalized = pd.DataFrame({
+        col: df[col].astype('float64')
+        if is_numeric_dtype(df[col]) and not is_bool_dtype(df[col])
+        else df[col].astype(str)
+        for col in sorted(df.columns)
+    })
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+
+
+class KeyIndex():
+    """
+    In-memory key -> row hash map for one dataset.
+    Persisted as <dataset>/_keys.parquet (key columns + hash) at compaction, so it loads
+    without reading the table; fragments written since then are folded in on load.
+    """
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.hashes = {}
+
+
+    def key_tuples(self, df):
+        return list(zip(*(df[k].tolist() for k in self.keys)))
+
+
+    def add(self, df, hashes=None):
+        if hashes is None:
+            hashes = row_hashes(df)
+        self.hashes.update(zip(self.key_tuples(df), hashes.tolist()))
+
+
+    def to_frame(self):
+        key_rows = list(self.hashes.keys())
+        frame = pd.DataFrame.from_records(key_rows, columns=self.keys)
+        frame['_row_hash'] = pd.array(list(self.hashes.values()), dtype='uint64')
+        return frame
+
+
+    @classmethod
+    def from_frame(cls, keys, frame):
+        index = cls(keys)
+        index.hashes = dict(zip(index.key_tuples(frame), frame['_row_hash'].tolist()))
+        return index
+
+
+class Dataset():
+    """
+    Append-only parquet table made of a compacted base file plus fragments listed in a manifest.
+
+        data/<name>.parquet                          base (the original single file)
+        data/<name>/artist_id=<id>/part-*.parquet    one fragment per ingest
+        data/<name>/_manifest.json                   {"version": n, "fragments": [...]}
+
+    Appends only write the new rows. Once enough fragments pile up they are merged into the
+    base by a background compaction; readers always see base + fragments as one table.
+    With `keys`, upsert() gives merge semantics: a later row replaces an earlier one with the same key.
+    """
+
+    def __init__(self, name, keys=None, partition_col=None, partition_name='artist_id', sort_by=None,
+                 root=DATA_DIR, compact_threshold=20):
+        self.name = name
+        self.keys = keys
+        self.sort_by = sort_by
+        self.partition_col = partition_col
+        self.partition_name = partition_name
+        self.compact_threshold = compact_threshold
+
+        self.base_path = os.path.join(root, f"{name}.parquet")
+        self.dir = os.path.join(root, name)
+        self.manifest_path = os.path.join(self.dir, "_manifest.json")
+        self.keys_path = os.path.join(self.dir, "_keys.parquet")
+        self.index = None
+        self._manifest_cache = None
+
+        self.lock = threading.RLock()
+        self.compact_lock = threading.Lock()
+
+
+    def _read_manifest(self):
+        """Current manifest; only re-parsed when the file changed on disk."""
+        try:
+            stat = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return {"version": 0, "fragments": []}
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if self._manifest_cache is None or self._manifest_cache[0] != stamp:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self._manifest_cache = (stamp, json.load(f))
+        return copy.deepcopy(self._manifest_cache[1])
+
+
+    def _write_manifest(self, manifest):
+        os.makedirs(self.dir, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+
+    @property
+    def version(self):
+        """Bumped on every append, so callers can tell when the table changed."""
+        with self.lock:
+            return self._read_manifest()["version"]
+
+
+    def _fragment_paths(self, manifest):
+        return [os.path.join(self.dir, f["path"]) for f in manifest["fragments"]]
+
+
+    def columns(self):
+        """Column names across base and fragments, from the parquet footers only."""
+        with self.lock:
+            manifest = self._read_manifest()
+            paths = ([self.base_path] if os.path.exists(self.base_path) else []) + self._fragment_paths(manifest)
+            names = [pq.read_schema(path).names for path in paths]
+
+        columns = []
+        for file_columns in names:
+            columns.extend(c for c in file_columns if c not in columns and not c.startswith('__index_level'))
+        return columns
+
+
+    def _conform(self, df):
+        """df with every column the table already has (missing ones as nulls), so fragments share the base schema."""
+        columns = self.columns()
+        if all(c in df.columns for c in columns):
+            return df
+        return df.reindex(columns=columns + [c for c in df.columns if c not in columns])
+
+
+    def _read_file(self, path, columns=None, filters=None):
+        """One base or fragment file; projected columns it doesn't have are skipped (filled in after concat)."""
+        if columns is not None:
+            names = pq.read_schema(path).names
+            columns = [c for c in columns if c in names]
+        return pd.read_parquet(path, columns=columns, filters=filters)
+
+
+    def _dedup(self, df):
+        """Keep the latest row per key (fragments come after the base, in append order)."""
+        return df.drop_duplicates(subset=self.keys, keep='last', ignore_index=True)
+
+
+    def read(self, columns=None, filters=None, partition=None):
+        """
+        Base + all fragments as one DataFrame.
+        columns are projected and filters (pyarrow DNF, e.g. [('artist_id', '==', 447)]) pushed down
+        to the row groups; with `partition`, fragments of other partitions aren't opened at all.
+        """
+        with self.lock:
+            manifest = self._read_manifest()
+            fragments = [
+                f for f in manifest["fragments"]
+                if partition is None or f.get("partition") in (partition, "mixed")
+            ]
+            has_updates = self.keys and any(f.get("updates") for f in fragments)
+
+            read_columns = columns
+            if has_updates and columns is not None:
+                read_columns = list(dict.fromkeys(list(self.keys) + list(columns)))
+
+            paths = ([self.base_path] if os.path.exists(self.base_path) else [])
+            paths += [os.path.join(self.dir, f["path"]) for f in fragments]
+            frames = [self._read_file(path, read_columns, filters) for path in paths]
+
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        if read_columns is not None:
+            df = df.reindex(columns=read_columns)
+
+        if has_updates:
+            df = self._dedup(df)
+            if columns is not None:
+                df = df[list(columns)]
+        return df
+
+
+    def read_since(self, version, columns=None):
+        """
+        Only the rows appended after `version`. Returns None when that delta can't be told apart
+        (fragments already compacted, or some of them replace existing rows) and a full read is needed.
+        """
+        with self.lock:
+            manifest = self._read_manifest()
+            newer = [f for f in manifest["fragments"] if f.get("version", 0) > version]
+
+            if len(newer) != manifest["version"] - version or any(f.get("updates") for f in newer):
+                return None
+
+            frames = [self._read_file(os.path.join(self.dir, f["path"]), columns) for f in newer]
+
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        df = pd.concat(frames, ignore_index=True)
+        return df if columns is None else df.reindex(columns=columns)
+
+
+    def _load_index(self):
+        """Key index from _keys.parquet plus any fragments appended since the last compaction."""
+        manifest = self._read_manifest()
+
+        if os.path.exists(self.keys_path):
+            index = KeyIndex.from_frame(self.keys, pd.read_parquet(self.keys_path))
+            for path in self._fragment_paths(manifest):
+                index.add(pd.read_parquet(path))
+        else:
+            # First use on a table without an index: one full read, persisted for next time
+            index = KeyIndex(self.keys)
+            table = self.read()
+            if not table.empty:
+                index.add(table)
+            os.makedirs(self.dir, exist_ok=True)
+            index.to_frame().to_parquet(self.keys_path, index=False)
+
+        return index
+
+
+    def upsert(self, df, partition=None):
+        """
+        Write only rows whose key is new or whose content changed; returns those rows.
+        Cost is O(len(df)): keys are checked against the in-memory index, not the table.
+        """
+        if df.empty:
+            return df
+
+        df = self._conform(self._dedup(df))
+        hashes = row_hashes(df)
+
+        with self.lock:
+            if self.index is None:
+                self.index = self._load_index()
+
+            key_tuples = self.index.key_tuples(df)
+            stored = [self.index.hashes.get(k) for k in key_tuples]
+            changed = [old != new for old, new in zip(stored, hashes.tolist())]
+
+            new_rows = df[changed]
+            if new_rows.empty:
+                return new_rows
+
+            updates = sum(1 for old, c in zip(stored, changed) if c and old is not None)
+            self.append(new_rows, partition=partition, updates=updates)
+            self.index.add(new_rows, hashes[changed])
+
+        return new_rows
+
+
+    def _partition_value(self, df, partition):
+        if partition is not None:
+            return partition
+        if self.partition_col in df.columns:
+            values = df[self.partition_col].dropna().unique()
+            if len(values) == 1:
+                return int(values[0])
+        return "mixed"
+
+
+    def append(self, df, partition=None, updates=0):
+        """Write df as a new fragment. Cost scales with len(df), not with the table."""
+        if df.empty:
+            return None
+
+        df = self._conform(df)
+        partition = self._partition_value(df, partition)
+        rel_path = os.path.join(
+            f"{self.partition_name}={partition}",
+            f"part-{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}.parquet"
+        )
+        path = os.path.join(self.dir, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = f"{path}.tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            manifest = self._read_manifest()
+            manifest["version"] += 1
+            manifest["fragments"].append({
+                "path": rel_path, "rows": len(df), "partition": partition, "updates": updates,
+                "version": manifest["version"]
+            })
+            self._write_manifest(manifest)
+            fragment_count = len(manifest["fragments"])
+
+        if fragment_count >= self.compact_threshold:
+            self.compact_async()
+
+        return rel_path
+
+
+    def compact(self):
+        """Merge the current fragments into the base file. Skipped if a compaction is already running."""
+        if not self.compact_lock.acquire(blocking=False):
+            return False
+
+        try:
+            with self.lock:
+                manifest = self._read_manifest()
+            compacted = [f["path"] for f in manifest["fragments"]]
+            if not compacted:
+                return False
+
+            # Fragment files are immutable, so the merge itself can run without blocking readers
+            paths = ([self.base_path] if os.path.exists(self.base_path) else []) + self._fragment_paths(manifest)
+            combined_df = pd.concat([pd.read_parquet(path) for path in paths], ignore_index=True)
+            if self.keys:
+                combined_df = self._dedup(combined_df)
+            if self.sort_by:
+                # Sorted, smallish row groups give tight min/max stats for filter pushdown
+                combined_df = combined_df.sort_values(self.sort_by, kind='stable', ignore_index=True)
+
+            tmp_path = f"{self.base_path}.tmp"
+            combined_df.to_parquet(tmp_path, index=False, row_group_size=ROW_GROUP_SIZE)
+
+            if self.keys:
+                keys_tmp_path = f"{self.keys_path}.tmp"
+                compacted_index = KeyIndex(self.keys)
+                compacted_index.add(combined_df)
+                compacted_index.to_frame().to_parquet(keys_tmp_path, index=False)
+
+            with self.lock:
+                os.replace(tmp_path, self.base_path)
+                if self.keys:
+                    os.replace(keys_tmp_path, self.keys_path)
+                manifest = self._read_manifest()
+                manifest["fragments"] = [f for f in manifest["fragments"] if f["path"] not in compacted]
+                self._write_manifest(manifest)
+
+            for rel_path in compacted:
+                path = os.path.join(self.dir, rel_path)
+                try:
+                    os.remove(path)
+                    os.rmdir(os.path.dirname(path))
+                except OSError:
+                    pass
+
+            return True
+        finally:
+            self.compact_lock.release()
+
+
+    def compact_async(self):
+        threading.Thread(target=self.compact, name=f"compact-{self.name}", daemon=True).start()
+
+
+ARTIST_DATA = Dataset("artist_data", keys=['artist_id'], partition_col='artist_id', sort_by='artist_id')
+SONG_DATA = Dataset("song_data", keys=['song_id'], partition_col='artist_id', sort_by='artist_id')
+# Contributor rows carry the contributor's id, so fragments are partitioned by the main artist explicitly
+CONTRIBUTER_DATA = Dataset("contributer_data", keys=['song_id', 'artist_id', 'label'], sort_by='song_id')
@@ -1,97 +1,230 @@
 import pandas as pd
 import json
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from client_cache import ResponseCache, get_artist_id_cache, get_response_cache
+
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class TokenBucket():
+    """Thread-safe token bucket: allows `rate` requests per second with bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
 
 class GeniusClient():
 
-    def __init__(self, client_secret):
+    def __init__(self, client_secret, base_url='https://api.genius.com', pool_size=10,
+                 max_retries=3, backoff_factor=0.5, timeout=(3.05, 15), rate_limit=20,
+                 artist_id_cache=None, response_cache=None, cache_max_age=3600):
         self.client_secret = client_secret
-        self.base_url = 'https://api.genius.com'
+        self.base_url = base_url
+        self.timeout = timeout
+        self.rate_limiter = TokenBucket(rate_limit) if rate_limit else None
+        self.session = self._build_session(pool_size, max_retries, backoff_factor)
+        self.artist_ids = artist_id_cache if artist_id_cache is not None else get_artist_id_cache()
+        self.response_cache = response_cache if response_cache is not None else get_response_cache()
+        self.cache_max_age = cache_max_age
+
+
+    def _build_session(self, pool_size, max_retries, backoff_factor):
+        """Keep-alive session with a connection pool and retry/backoff on 429 and 5xx."""
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["GET"]),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Authorization": f"Bearer {self.client_secret}"})
+        return session
+
+
+    def _get(self, path, params=None, timeout=None, headers=None):
+        query = {"text_format": "plain"}
+        query.update(params or {})
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+        return self.session.get(
+            f"{self.base_url}{path}",
+            params=query,
+            headers=headers,
+            timeout=timeout or self.timeout
+        )
+
+
+    def _get_cached_json(self, path, params=None):
+        """
+        GET a payload through the response cache. Entries younger than cache_max_age are served
+        without a request; older ones are revalidated with If-None-Match / If-Modified-Since,
+        so an unchanged payload costs a 304 and no body.
+        """
+        key = ResponseCache.make_key(f"{self.base_url}{path}", params)
+        cached = self.response_cache.lookup(key)
+
+        headers = {}
+        if cached is not None:
+            if time.time() - cached.fetched_at < self.cache_max_age:
+                return json.loads(cached.body)
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        r = self._get(path, params=params, headers=headers)
+
+        if r.status_code == 304 and cached is not None:
+            self.response_cache.touch(key)
+            return json.loads(cached.body)
+
+        if r.status_code == 200:
+            self.response_cache.store(
+                key, r.content,
+                etag=r.headers.get("ETag"),
+                last_modified=r.headers.get("Last-Modified")
+            )
+
+        return r.json()
+
+
+    def close(self):
+        self.session.close()
 
 
     def get_artist_id(self, input):
-        input = input.replace(" ", "%20").lower()
-        url = f"{self.base_url}/search?q={input}"
-        headers = {"Authorization": f"Bearer {self.client_secret}"}
-        params = {"text_format": "plain"}
-        r = requests.get(url, headers=headers, params=params)
+        cached_id = self.artist_ids.get(input)
+        if cached_id is not None:
+            return cached_id
+
+        r = self._get("/search", params={"q": input.lower()})
         hits = r.json()["response"]["hits"]
 
+        # Every hit carries a real name -> id pair, so keep them all
         for h in hits:
-            name = h["result"]["primary_artist"]["name"].replace(" ", "%20").lower()
-            if name == input:
-                return h["result"]["primary_artist"]["id"]
+            primary_artist = h["result"]["primary_artist"]
+            self.artist_ids.put(primary_artist["name"], primary_artist["id"], persist=False)
 
-        return hits[0]["result"]["primary_artist"]["id"] #fallback
-    
+        artist_id = hits[0]["result"]["primary_artist"]["id"] #fallback
+        for h in hits:
+            name = h["result"]["primary_artist"]["name"].lower()
+            if name == input.lower():
+                artist_id = h["result"]["primary_artist"]["id"]
+                break
 
-    def get_song_id(self, song_id):
-        return 0
+        self.artist_ids.put(input, artist_id)
+        return artist_id
 
 
-    def get_artist_data(self, artist):
-        artist_id = self.get_artist_id(artist)
-        url = f"{self.base_url}/artists/{artist_id}"
-        headers = {"Authorization": f"Bearer {self.client_secret}"}
-        params = {"text_format": "plain"}
-        r = requests.get(url, headers=headers, params=params)
-        return r.json()
-    
+    def get_song_id(self, song_id):
+        return 0
 
-    def get_artist_songs(self, artist, num_returned, page, artist_id=None, all_songs=None):
-        if all_songs is None:
-            all_songs = []
 
+    def get_artist_data(self, artist, artist_id=None):
         if artist_id is None:
             artist_id = self.get_artist_id(artist)
+        return self._get_cached_json(f"/artists/{artist_id}")
+
 
-        url = f"{self.base_url}/artists/{artist_id}/songs"
-        headers = {"Authorization": f"Bearer {self.client_secret}"}
+    def _get_artist_songs_page(self, artist_id, num_returned, page):
         params = {
             "per_page": num_returned,
             "page": page,
             "sort": "popularity",
-            "include_features": False,
-            "text_format": "plain"
+            "include_features": False
         }
 
-        r = requests.get(url, headers=headers, params=params)
+        r = self._get(f"/artists/{artist_id}/songs", params=params)
 
         if r.status_code != 200:
             raise RuntimeError(
                 f"Genius API error {r.status_code}: {r.text[:200]}"
             )
 
-        data = r.json()
+        return r.json()
 
-        filtered_songs = [
-            song for song in data["response"]["songs"]
-            if song["primary_artist"]["id"] == artist_id
-        ]
 
-        all_songs.extend(filtered_songs)
+    def iter_artist_songs(self, artist_id, num_returned=50, page=1, prefetch=True):
+        """
+        Yield the artist's songs page by page (only songs where they are the primary artist).
+        With prefetch, page N+1 is requested in the background while page N is being consumed.
+        """
+        pool = ThreadPoolExecutor(max_workers=1) if prefetch else None
 
-        next_page = data["response"]["next_page"]
+        try:
+            data = self._get_artist_songs_page(artist_id, num_returned, page)
+
+            while True:
+                next_page = data["response"]["next_page"]
+                pending = None
+
+                if next_page and pool is not None:
+                    pending = pool.submit(self._get_artist_songs_page, artist_id, num_returned, next_page)
+
+                yield [
+                    song for song in data["response"]["songs"]
+                    if song["primary_artist"]["id"] == artist_id
+                ]
+
+                if not next_page:
+                    return
+
+                if pending is not None:
+                    data = pending.result()
+                else:
+                    data = self._get_artist_songs_page(artist_id, num_returned, next_page)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+
+    def get_artist_songs(self, artist, num_returned, page, artist_id=None):
+        if artist_id is None:
+            artist_id = self.get_artist_id(artist)
+
+        all_songs = []
+        for songs in self.iter_artist_songs(artist_id, num_returned=num_returned, page=page):
+            all_songs.extend(songs)
 
-        if next_page:
-            return self.get_artist_songs(
-                artist,
-                num_returned=num_returned,
-                page=next_page,
-                all_songs=all_songs,
-                artist_id=artist_id
-            )
-        
         return {
             "response": {
                 "songs": all_songs
             }
         }
 
-    
+
     def get_song_data(self, song_id):
-        url = f"{self.base_url}/songs/{song_id}"
-        headers = {"Authorization": f"Bearer {self.client_secret}"}
-        params = {"text_format": "plain"}
-        r = requests.get(url, headers=headers, params=params)
-        return r.json()
\ No newline at end of file
+        return self._get_cached_json(f"/songs/{song_id}")
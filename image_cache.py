@@ -0,0 +1,114 @@
+import hashlib
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+import streamlit as st
+from PIL import Image, UnidentifiedImageError
+
+from caching import ContentStore
+from client_cache import CACHE_DIR
+
+
+# Longest side of the stored thumbnails, per use
+ICON_SIZE = 120
+CARD_SIZE = 400
+HEADER_SIZE = 640
+
+
+class ImageCache():
+    """
+    Local proxy for cover art: each remote image is downloaded once, shrunk to a thumbnail
+    (WebP, longest side max_size) and stored content-addressed under cache/images/ (a ContentStore
+    with file blobs), so identical thumbnails are kept once. st.image is then given the local file,
+    which Streamlit serves itself. The least recently used thumbnails are evicted once the files
+    exceed max_bytes.
+    """
+
+    def __init__(self, root=os.path.join(CACHE_DIR, "images"), max_bytes=512 * 1024 * 1024,
+                 timeout=(3.05, 15), max_workers=8, retry_after=600):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.retry_after = retry_after
+        self.failed = {}
+        self.session = requests.Session()
+        self.blobs = ContentStore(os.path.join(root, "index.sqlite"), max_bytes, blob_dir=root, blob_suffix=".webp")
+
+
+    @staticmethod
+    def make_key(url, max_size):
+        return hashlib.sha256(f"{url}|{max_size}".encode('utf-8')).hexdigest()
+
+
+    def lookup(self, url, max_size):
+        entry = self.blobs.get(self.make_key(url, max_size))
+        return None if entry is None else entry[0]
+
+
+    def thumbnail(self, body, max_size):
+        image = Image.open(io.BytesIO(body))
+        image.thumbnail((max_size, max_size))
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+        buffer = io.BytesIO()
+        image.save(buffer, format="WEBP", quality=80)
+        return buffer.getvalue()
+
+
+    def store(self, url, max_size, data):
+        return self.blobs.put(self.make_key(url, max_size), data)
+
+
+    def get(self, url, max_size=CARD_SIZE):
+        """Local thumbnail path for url, downloading it on first use; None if it can't be fetched."""
+        if not isinstance(url, str) or not url:
+            return None
+
+        path = self.lookup(url, max_size)
+        if path is not None:
+            return path
+
+        # Don't retry a failing image on every rerun
+        if time.time() - self.failed.get(url, 0) < self.retry_after:
+            return None
+
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            data = self.thumbnail(response.content, max_size)
+        except (requests.RequestException, UnidentifiedImageError, OSError) as e:
+            print(f"Image cache: could not fetch {url}: {e}")
+            self.failed[url] = time.time()
+            return None
+
+        self.failed.pop(url, None)
+        return self.store(url, max_size, data)
+
+
+    def get_many(self, urls, max_size=CARD_SIZE):
+        """get() for several images, downloading the missing ones concurrently; results in input order."""
+        urls = list(urls)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(lambda url: self.get(url, max_size), urls))
+
+
+    def close(self):
+        self.blobs.close()
+        self.session.close()
+
+
+def image_source(url, max_size=CARD_SIZE):
+    """What to hand st.image: the cached local thumbnail if there is one, else the remote URL."""
+    local_path = get_image_cache().get(url, max_size) if pd.notna(url) else None
+    return local_path or url
+
+
+@st.cache_resource
+def get_image_cache():
+    """Process-wide image cache shared by every session."""
+    return ImageCache()
@@ -1,9 +1,48 @@
+import json
 import networkx as nx
 from pyvis.network import Network
 import streamlit.components.v1 as components
+import numpy as np
 import pandas as pd
 import streamlit as st
-import ast
+from caching import LRUCache
+
+
+def _group_distinct(codes, values, n_groups):
+    """Distinct values per group code, each group in order of first appearance."""
+    pairs = pd.DataFrame({'code': codes, 'value': values}).drop_duplicates()
+    pair_codes = pairs['code'].to_numpy()
+    order = np.argsort(pair_codes, kind='stable')
+    bounds = np.cumsum(np.bincount(pair_codes, minlength=n_groups))[:-1]
+    return np.split(pairs['value'].to_numpy()[order], bounds)
+
+
+def get_collaborator_table(main_artist, df_songs, df_contributors):
+    """
+    Columnar collaborator summary: one row per collaborator (in order of first credit)
+    with 'count' (credits), 'roles' (distinct roles) and 'songs' (distinct titles, in credit order).
+    """
+    song_titles = df_songs.drop_duplicates('song_id', keep='last').set_index('song_id')['title']
+    credits = df_contributors[df_contributors['song_id'].isin(song_titles.index)]
+
+    names = credits['artist_name']
+    keep = (names.notna() & (names != '') & (names != main_artist)).to_numpy()
+
+    codes, uniques = pd.factorize(names.to_numpy()[keep])
+    if 'label' in credits.columns:
+        roles = credits['label'].to_numpy()[keep]
+    else:
+        roles = np.full(len(codes), 'Contributor', dtype=object)
+    titles = credits['song_id'][keep].map(song_titles).fillna('Unknown').to_numpy()
+
+    if len(uniques) == 0:
+        return pd.DataFrame({'count': [], 'roles': [], 'songs': []}, index=pd.Index([], name='name'))
+
+    return pd.DataFrame({
+        'count': np.bincount(codes, minlength=len(uniques)),
+        'roles': _group_distinct(codes, roles, len(uniques)),
+        'songs': [songs.tolist() for songs in _group_distinct(codes, titles, len(uniques))]
+    }, index=pd.Index(uniques, name='name'))
 
 
 def get_collaborators(main_artist, df_songs, df_contributors=None):
@@ -11,29 +50,26 @@ def get_collaborators(main_artist, df_songs, df_contributors=None):
     Extract all collaborators and their metadata.
     Returns: dict with {name: {'count', 'roles', 'songs'}}
     """
-    collaborators = {}
-    
-    if df_contributors is not None:
-        song_ids = df_songs['song_id'].tolist()
-        song_titles = dict(zip(df_songs['song_id'], df_songs['title']))
-        
-        artist_contributors = df_contributors[df_contributors['song_id'].isin(song_ids)]
-        
-        for _, row in artist_contributors.iterrows():
-            name = row.get('artist_name')
-            role = row.get('label', 'Contributor')
-            song_id = row.get('song_id')
-            song_title = song_titles.get(song_id, 'Unknown')
-            
-            if name and name != main_artist:
-                if name not in collaborators:
-                    collaborators[name] = {'count': 0, 'roles': set(), 'songs': []}
-                collaborators[name]['count'] += 1
-                collaborators[name]['roles'].add(role)
-                if song_title not in collaborators[name]['songs']:
-                    collaborators[name]['songs'].append(song_title)
-    
-    return collaborators
+    if df_contributors is None:
+        return {}
+
+    table = get_collaborator_table(main_artist, df_songs, df_contributors)
+
+    return {
+        name: {'count': int(count), 'roles': set(roles), 'songs': songs}
+        for name, count, roles, songs in zip(table.index, table['count'], table['roles'], table['songs'])
+    }
+
+
+def collaborator_hover(collab_name, data, show_detailed_hover=False):
+    count = data['count']
+    if show_detailed_hover:
+        roles_text = ", ".join(sorted(data['roles'])) if data['roles'] else "Featured Artist"
+        songs_preview = "• " + "• ".join(data['songs'][:5])
+        if len(data['songs']) > 5:
+            songs_preview += f"...and {len(data['songs']) - 5} more"
+        return f"{collab_name}; {count} collaboration(s); Roles:{roles_text}; Songs:{songs_preview}"
+    return f"{collab_name}; {count} collaboration(s)"
 
 
 def build_network_graph(main_artist, collaborators, limit=None, show_detailed_hover=False):
@@ -46,18 +82,8 @@ def build_network_graph(main_artist, collaborators, limit=None, show_detailed_ho
         sorted_collabs = sorted_collabs[:limit]
     
     for collab_name, data in sorted_collabs:
-        count = data['count']
-        
         node_size = 40
-        
-        if show_detailed_hover:
-            roles_text = ", ".join(sorted(data['roles'])) if data['roles'] else "Featured Artist"
-            songs_preview = "• " + "• ".join(data['songs'][:5])
-            if len(data['songs']) > 5:
-                songs_preview += f"...and {len(data['songs']) - 5} more"
-            hover = f"{collab_name}; {count} collaboration(s); Roles:{roles_text}; Songs:{songs_preview}"
-        else:
-            hover = f"{collab_name}; {count} collaboration(s)"
+        hover = collaborator_hover(collab_name, data, show_detailed_hover)
         
         G.add_node(collab_name, size=node_size, color="#FF4B4B", title=hover)
         G.add_edge(main_artist, collab_name, weight=10)
@@ -65,95 +91,344 @@ def build_network_graph(main_artist, collaborators, limit=None, show_detailed_ho
     return G
 
 
-def render_network(G, height='300px', filename='graph'):
-    """Render NetworkX graph as interactive HTML using PyVis."""
-    net = Network(height=height, bgcolor="#1E1E1E", font_color='white')
+# Level of detail: collaborators beyond max_nodes are folded into one super-node per group
+# (their role) and revealed in the browser, LOD_EXPAND_STEP at a time, when the super-node is clicked
+LOD_EXPAND_STEP = 25
+LOD_MAX_GROUPS = 8
+SUPER_NODE_COLOR = "#6C757D"
+
+
+def add_super_nodes(G, main_artist, hidden):
+    """
+    Attach one super-node per group to the main artist for the hidden collaborators.
+    hidden: (group, node attributes incl. 'id') pairs, heaviest first.
+    Returns {super-node id: {'label': group, 'members': [node attributes]}} for the expand script.
+    """
+    # The largest groups keep their own super-node, smaller ones share an "Other" node
+    sizes = {}
+    for group, _ in hidden:
+        sizes[group] = sizes.get(group, 0) + 1
+    kept = set(sorted(sizes, key=sizes.get, reverse=True)[:LOD_MAX_GROUPS - 1]) if len(sizes) > LOD_MAX_GROUPS else set(sizes)
+
+    groups = {}
+    for group, node in hidden:
+        groups.setdefault(group if group in kept else "Other", []).append(node)
+
+    members = {}
+    for group, nodes in groups.items():
+        node_id = f"group:{group}"
+        G.add_node(
+            node_id, label=f"{group} (+{len(nodes)})", shape='dot', color=SUPER_NODE_COLOR,
+            size=float(min(25 + 3 * np.log2(len(nodes) + 1), 60)),
+            title=f"{len(nodes)} more {group} collaborator(s) - click to expand"
+        )
+        G.add_edge(main_artist, node_id, weight=10)
+        members[node_id] = {'label': group, 'members': nodes}
+    return members
+
+
+def build_lod_graph(main_artist, collaborators, max_nodes=50, show_detailed_hover=False):
+    """
+    The max_nodes heaviest collaborators as nodes, everyone else grouped by role into super-nodes.
+    Returns (G, members) as described in add_super_nodes.
+    """
+    G = build_network_graph(main_artist, collaborators, limit=max_nodes, show_detailed_hover=show_detailed_hover)
+
+    sorted_collabs = sorted(collaborators.items(), key=lambda x: x[1]['count'], reverse=True)
+    hidden = [
+        (sorted(data['roles'])[0] if data['roles'] else "Featured Artist", {
+            'id': collab_name, 'label': collab_name, 'size': 25, 'color': "#FF4B4B",
+            'title': collaborator_hover(collab_name, data, show_detailed_hover)
+        })
+        for collab_name, data in sorted_collabs[max_nodes:]
+    ]
+    return G, add_super_nodes(G, main_artist, hidden)
+
+
+RENDER_CACHE_SIZE = 32
+
+_render_cache = LRUCache(RENDER_CACHE_SIZE)
+
+
+def render_cache_key(view, artist_id, data_version, role=None, max_nodes=None, server_layout=False):
+    """(artist_id, view, role, max_nodes, data version, layout); None (uncached) if the caller gave no artist/version."""
+    if artist_id is None or data_version is None:
+        return None
+    return (artist_id, view, role, max_nodes, data_version, server_layout)
+
+
+def cached_render(key, build):
+    """
+    Finished graph HTML from the in-memory LRU, or build() it and keep it.
+    build may return None (nothing to draw); that result is cached too.
+    """
+    if key is None:
+        return build()
+    return _render_cache.get_or_compute(key, build)
+
+
+# PyVis' "local" mode links vis-network from the CDN, so the browser fetches and caches the bundle once
+# instead of every graph inlining ~700KB of it. It also links lib/bindings/utils.js by a relative path,
+# which can't resolve inside the component iframe (and the graphs don't use it), so that tag is dropped.
+UNRESOLVED_ASSET_TAG = '<script src="lib/bindings/utils.js"></script>'
+
+
+# Above this many nodes the all-pairs force layout gets too memory hungry; a spiral is used instead
+FORCE_LAYOUT_MAX_NODES = 800
+
+
+def spiral_positions(n, spacing=1.0):
+    """Sunflower (golden-angle) spiral, evenly filling a disc; index 0 sits in the center."""
+    i = np.arange(n)
+    radius = spacing * np.sqrt(i)
+    angle = i * np.pi * (3 - np.sqrt(5))
+    return np.column_stack([radius * np.cos(angle), radius * np.sin(angle)])
+
+
+def spring_positions(G, iterations=60, scale=None, seed=0):
+    """
+    Fruchterman-Reingold layout computed server-side with numpy (vectorized all-pairs repulsion).
+    Graphs above FORCE_LAYOUT_MAX_NODES get a spiral ordered by degree instead.
+    Returns {node: (x, y)} in vis-network pixels, centered on 0.
+    """
+    nodes = list(G.nodes)
+    n = len(nodes)
+    if n == 0:
+        return {}
+    scale = scale or 60 * np.sqrt(n) + 150
+
+    if n > FORCE_LAYOUT_MAX_NODES:
+        by_degree = sorted(range(n), key=lambda i: -G.degree(nodes[i]))
+        pos = np.empty((n, 2))
+        pos[by_degree] = spiral_positions(n)
+    else:
+        index = {node: i for i, node in enumerate(nodes)}
+        edges = np.array([(index[u], index[v]) for u, v in G.edges], dtype=np.int64).reshape(-1, 2)
+
+        pos = np.random.default_rng(seed).random((n, 2)) - 0.5
+        k = np.sqrt(1.0 / n)
+        step = 0.1
+        cooling = step / (iterations + 1)
+
+        for _ in range(iterations):
+            dx = pos[:, 0, None] - pos[None, :, 0]
+            dy = pos[:, 1, None] - pos[None, :, 1]
+            dist2 = np.maximum(dx ** 2 + dy ** 2, 1e-4)
+            # Repulsion k^2/d along each pair's unit vector; a node's own term is zero (dx = dy = 0)
+            push = k * k / dist2
+            disp = np.column_stack([(dx * push).sum(axis=1), (dy * push).sum(axis=1)])
+
+            # Attraction d^2/k along the edges
+            delta = pos[edges[:, 0]] - pos[edges[:, 1]]
+            pull = delta * (np.linalg.norm(delta, axis=1) / k)[:, None]
+            np.subtract.at(disp, edges[:, 0], pull)
+            np.add.at(disp, edges[:, 1], pull)
+
+            length = np.maximum(np.linalg.norm(disp, axis=1), 1e-4)
+            pos += disp * (np.minimum(length, step) / length)[:, None]
+            step -= cooling
+
+    pos -= pos.mean(axis=0)
+    pos *= scale / max(np.abs(pos).max(), 1e-9)
+    return {node: (float(x), float(y)) for node, (x, y) in zip(nodes, pos)}
+
+
+def graph_html(G, height='300px', positions=None):
+    """
+    Interactive PyVis HTML for a NetworkX graph, generated as a string.
+    Nothing touches the filesystem, so concurrent sessions can't read each other's graphs.
+    With precomputed positions ({node: (x, y)}) client-side physics is turned off, so the
+    browser draws the graph immediately instead of simulating the layout.
+    """
+    net = Network(height=height, bgcolor="#1E1E1E", font_color='white', cdn_resources='local')
     net.from_nx(G)
-    net.barnes_hut(gravity=-8000, central_gravity=0.3, spring_length=100, spring_strength=0.001)
-    
-    try:
-        path = '/tmp'
-        net.save_graph(f'{path}/{filename}.html')
-        with open(f'{path}/{filename}.html', 'r', encoding='utf-8') as f:
-            html_content = f.read()
-    except:
-        net.save_graph(f'{filename}.html')
-        with open(f'{filename}.html', 'r', encoding='utf-8') as f:
-            html_content = f.read()
+
+    if positions is None:
+        net.barnes_hut(gravity=-8000, central_gravity=0.3, spring_length=100, spring_strength=0.001)
+    else:
+        for node in net.nodes:
+            node['x'], node['y'] = positions[node['id']]
+        net.toggle_physics(False)
+        net.set_edge_smooth('continuous')
+    return net.generate_html().replace(UNRESOLVED_ASSET_TAG, '')
+
+
+def layout_html(G, height, server_layout):
+    return graph_html(G, height=height, positions=spring_positions(G) if server_layout else None)
+
+
+# Appended to the PyVis page (which defines the global network / nodes / edges): clicking a super-node
+# places its next batch of members in a ring around it and updates its remaining count
+LOD_SCRIPT = """
+<script type="text/javascript">
+    var superNodes = __SUPER_NODES__;
+    network.on("click", function (params) {
+        if (params.nodes.length !== 1 || !(params.nodes[0] in superNodes)) {
+            return;
+        }
+        var groupId = params.nodes[0];
+        var group = superNodes[groupId];
+        var batch = group.members.splice(0, __EXPAND_STEP__);
+        if (batch.length === 0) {
+            return;
+        }
+
+        var center = network.getPositions([groupId])[groupId];
+        var radius = 120 + 6 * batch.length;
+        batch.forEach(function (member, i) {
+            var angle = 2 * Math.PI * i / batch.length;
+            member.x = center.x + radius * Math.cos(angle);
+            member.y = center.y + radius * Math.sin(angle);
+        });
+        nodes.add(batch);
+        edges.add(batch.map(function (member) { return {from: groupId, to: member.id}; }));
+
+        var remaining = group.members.length;
+        nodes.update({id: groupId, label: remaining ? group.label + " (+" + remaining + ")" : group.label});
+    });
+</script>
+"""
+
+
+def lod_html(G, members, height, server_layout):
+    """Graph HTML plus, when some collaborators were folded into super-nodes, the click-to-expand script."""
+    html_content = layout_html(G, height, server_layout)
+    if not members:
+        return html_content
+
+    script = (LOD_SCRIPT
+              .replace("__SUPER_NODES__", json.dumps(members).replace("</", "<\\/"))
+              .replace("__EXPAND_STEP__", str(LOD_EXPAND_STEP)))
+    return html_content.replace("</body>", script + "</body>", 1)
+
+
+def show_html(html_content, height='300px'):
     components.html(html_content, height=int(height.replace('px', '')) + 10)
 
 
-def render_mini_network(main_artist, df_songs, df_contributors=None):
+def render_mini_network(main_artist, df_songs, df_contributors=None, artist_id=None, data_version=None,
+                        server_layout=True):
     """Compact network for overview card."""
-    collaborators = get_collaborators(main_artist, df_songs, df_contributors)
-    
-    if not collaborators:
+    def build():
+        collaborators = get_collaborators(main_artist, df_songs, df_contributors)
+        if not collaborators:
+            return None
+        G = build_network_graph(main_artist, collaborators, limit=15, show_detailed_hover=False)
+        return layout_html(G, '300px', server_layout)
+
+    # Without contributor data there is nothing to draw, and no need to cache that
+    key = None
+    if df_contributors is not None:
+        key = render_cache_key('mini', artist_id, data_version, max_nodes=15, server_layout=server_layout)
+    html_content = cached_render(key, build)
+
+    if html_content is None:
         st.info(f"No collaborators found for {main_artist}")
         return
-    G = build_network_graph(main_artist, collaborators, limit=15, show_detailed_hover=False)
-    render_network(G, height='300px', filename='mini_graph')
+    show_html(html_content, height='300px')
 
 
-def render_full_network(main_artist, df_songs, df_contributors=None, max_nodes=50):
-    """Full-page interactive network."""
+def render_full_network(main_artist, df_songs, df_contributors=None, max_nodes=50, artist_id=None, data_version=None,
+                        server_layout=True, level_of_detail=True):
+    """
+    Full-page interactive network.
+    With level_of_detail, collaborators beyond max_nodes are grouped into expandable role super-nodes
+    instead of being dropped.
+    """
     if df_contributors is None:
         st.warning("Contributor data required for full network")
         return
-    
-    collaborators = get_collaborators(main_artist, df_songs, df_contributors)
-    
-    if not collaborators:
+
+    def build():
+        collaborators = get_collaborators(main_artist, df_songs, df_contributors)
+        if not collaborators:
+            return None
+        if level_of_detail:
+            G, members = build_lod_graph(main_artist, collaborators, max_nodes=max_nodes, show_detailed_hover=True)
+            return lod_html(G, members, '600px', server_layout)
+        G = build_network_graph(main_artist, collaborators, limit=max_nodes, show_detailed_hover=True)
+        return layout_html(G, '600px', server_layout)
+
+    view = 'full-lod' if level_of_detail else 'full'
+    html_content = cached_render(
+        render_cache_key(view, artist_id, data_version, max_nodes=max_nodes, server_layout=server_layout), build
+    )
+
+    if html_content is None:
         st.info(f"No collaborators found for {main_artist}")
         return
-    
-    G = build_network_graph(main_artist, collaborators, limit=max_nodes, show_detailed_hover=True)
-    render_network(G, height='600px', filename='full_graph')
+    show_html(html_content, height='600px')
 
 
-def render_role_network(main_artist, df_songs, df_contributors, selected_role=None):
-    """Network filtered by contributor role with color coding."""
-    if df_contributors is None:
-        st.warning("Contributor data required")
-        return
-    
-    song_ids = df_songs['song_id'].tolist()
-    artist_contributors = df_contributors[df_contributors['song_id'].isin(song_ids)]
-    
-    if selected_role:
-        artist_contributors = artist_contributors[artist_contributors['label'] == selected_role]
-    
-    if len(artist_contributors) == 0:
-        st.info(f"No contributors found" + (f" with role: {selected_role}" if selected_role else ""))
-        return
-    
-    # Build graph with role-based colors
+ROLE_COLORS = {
+    'Producer': '#FFD700', 'Writer': '#00CED1', 'Featured Artist': '#FF69B4',
+    'Composer': '#9370DB', 'Engineer': '#32CD32', 'Publisher': '#FFA500'
+}
+
+
+def build_role_graph(main_artist, artist_contributors, max_nodes=None):
+    """
+    Star graph of an artist's contributors, colored by their first role.
+    With max_nodes, only the contributors with the most credits get their own node and the rest
+    are grouped into super-nodes by first role. Returns (G, members) as described in add_super_nodes.
+    """
     G = nx.Graph()
     G.add_node(main_artist, size=35, color="#EAC40A", title=f"{main_artist} - Main Artist")
-    
-    role_colors = {
-        'Producer': '#FFD700', 'Writer': '#00CED1', 'Featured Artist': '#FF69B4',
-        'Composer': '#9370DB', 'Engineer': '#32CD32', 'Publisher': '#FFA500'
-    }
 
     contributor_stats = artist_contributors.groupby('artist_name').agg({
         'label': lambda x: ', '.join(sorted(set(x))[:3]),
         'song_id': 'count' 
     }).reset_index()
     contributor_stats.columns = ['artist_name', 'roles', 'count']
-    
-    for _, row in contributor_stats.iterrows():
-        contributor = row['artist_name']
-        roles = row['roles']
-        count = row['count']
-        
-        if contributor != main_artist:
-            first_role = roles.split(',')[0].strip()
-            color = role_colors.get(first_role, '#FF4B4B')
-            node_size = 40  
-            
-            G.add_node(contributor, size=node_size, color=color, 
-                      title=f"{contributor}Roles: {roles}{count} credits")
-
-            G.add_edge(main_artist, contributor, weight=10)
-    
-    render_network(G, height='500px', filename='role_graph')
+    contributor_stats = contributor_stats[contributor_stats['artist_name'] != main_artist]
+    contributor_stats = contributor_stats.sort_values('count', ascending=False, kind='stable')
+
+    hidden = []
+    for position, (contributor, roles, count) in enumerate(contributor_stats.itertuples(index=False)):
+        first_role = roles.split(',')[0].strip()
+        color = ROLE_COLORS.get(first_role, '#FF4B4B')
+        title = f"{contributor}Roles: {roles}{count} credits"
+
+        if max_nodes is not None and position >= max_nodes:
+            hidden.append((first_role, {'id': contributor, 'label': contributor, 'size': 25, 'color': color, 'title': title}))
+            continue
+
+        node_size = 40  
+        G.add_node(contributor, size=node_size, color=color, title=title)
+        G.add_edge(main_artist, contributor, weight=10)
+
+    return G, add_super_nodes(G, main_artist, hidden)
+
+
+def render_role_network(main_artist, df_songs, df_contributors, selected_role=None, artist_id=None, data_version=None,
+                        server_layout=True, max_nodes=100):
+    """
+    Network filtered by contributor role with color coding.
+    Contributors beyond max_nodes are grouped into expandable super-nodes (None draws everyone).
+    """
+    if df_contributors is None:
+        st.warning("Contributor data required")
+        return
+
+    def build():
+        song_ids = df_songs['song_id'].tolist()
+        artist_contributors = df_contributors[df_contributors['song_id'].isin(song_ids)]
+
+        if selected_role:
+            artist_contributors = artist_contributors[artist_contributors['label'] == selected_role]
+
+        if len(artist_contributors) == 0:
+            return None
+        G, members = build_role_graph(main_artist, artist_contributors, max_nodes=max_nodes)
+        return lod_html(G, members, '500px', server_layout)
+
+    html_content = cached_render(
+        render_cache_key('role', artist_id, data_version, role=selected_role, max_nodes=max_nodes,
+                         server_layout=server_layout),
+        build
+    )
+
+    if html_content is None:
+        st.info(f"No contributors found" + (f" with role: {selected_role}" if selected_role else ""))
+        return
+    show_html(html_content, height='500px')
@@ -1,9 +1,12 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
 import plotly.express as px
-import networkx as nx
 import network as netwrk
+from data_store import get_data_store
+from collab_graph import get_collab_graph
+import aggregates as agg
+
+# Song columns this page reads (projected when loading)
+SONG_COLUMNS = ['song_id', 'title', 'release_date', 'pageviews']
 
 st.set_page_config(page_title="Collaborator Network", layout="wide")
 
@@ -11,18 +14,14 @@ if st.session_state.selected_artist is None:
     st.warning("Please select an artist from the sidebar")
     st.stop()
 
-contributor_df = pd.read_parquet("data/contributer_data.parquet")
-
 artist_name = st.session_state.selected_artist
 artist_id = st.session_state.artist_id
-artist_songs = st.session_state.existing_song_df[
-    st.session_state.existing_song_df['artist_id'] == artist_id
-]
+store = get_data_store()
+artist_songs = store.artist_songs(artist_id, columns=SONG_COLUMNS)
 
 st.title(f"🕸️ {artist_name}'s Collaboration Network")
 
-song_ids = artist_songs['song_id'].tolist()
-artist_contributors = contributor_df[contributor_df['song_id'].isin(song_ids)]
+artist_contributors = store.artist_contributors(artist_id)
 
 tab1, tab2, tab3, tab4 = st.tabs([
     "🎭 By Role", 
@@ -34,10 +33,7 @@ tab1, tab2, tab3, tab4 = st.tabs([
 
 with tab1:
     st.subheader("Contributions by Role")
-    role_counts = artist_contributors.groupby('label').agg({
-        'artist_name': 'nunique',
-        'song_id': 'nunique'
-    }).reset_index()
+    role_counts = agg.artist_aggregate('roles', artist_id)
     role_counts.columns = ['Role', 'Total Contributors', 'Songs Involved']
     role_counts = role_counts.sort_values('Total Contributors', ascending=False)
     
@@ -89,10 +85,7 @@ with tab1:
 with tab2:
     st.subheader("Most Frequent Collaborators")
     
-    all_collaborators = artist_contributors.groupby('artist_name').agg({
-        'song_id': 'nunique',
-        'label': lambda x: ', '.join(sorted(set(x)))
-    }).reset_index()
+    all_collaborators = agg.artist_aggregate('collaborators', artist_id)
     all_collaborators.columns = ['Collaborator', 'Songs Together', 'Roles']
     all_collaborators = all_collaborators.sort_values('Songs Together', ascending=False)
     
@@ -159,20 +152,9 @@ with tab2:
 
 with tab3:
     st.subheader("🏢 Roles Distribution Analysis")
-    role_timeline = artist_contributors.merge(
-        artist_songs[['song_id', 'release_date']],
-        on='song_id'
-    )
+    roles_per_year = agg.artist_aggregate('roles_per_year', artist_id)
     
-    if 'release_date' in role_timeline.columns:
-        role_timeline['release_date'] = pd.to_datetime(
-            role_timeline['release_date'], 
-            errors='coerce'
-        )
-        role_timeline['year'] = role_timeline['release_date'].dt.year
-        
-        roles_per_year = role_timeline.groupby(['year', 'label']).size().reset_index(name='count')
-        
+    if len(roles_per_year) > 0:
         fig = px.line(
             roles_per_year,
             x='year',
@@ -184,15 +166,7 @@ with tab3:
         st.plotly_chart(fig, width='stretch')
     st.divider()
     
-    role_diversity = artist_contributors.groupby('song_id').agg({
-        'label': lambda x: len(set(x)),
-        'artist_name': 'count'
-    }).reset_index()
-    role_diversity.columns = ['song_id', 'unique_roles', 'total_contributors']
-    role_diversity = role_diversity.merge(
-        artist_songs[['song_id', 'title', 'pageviews']],
-        on='song_id'
-    )
+    role_diversity = agg.artist_aggregate('song_diversity', artist_id)
     
     st.subheader("Songs by Contributor Diversity")
     
@@ -225,23 +199,49 @@ with tab4:
         options=["All Collaborators", "By Role"],
         horizontal=True
     )
+    st.caption("Grey nodes group the remaining collaborators by role; click one to expand it.")
     
     if network_type == "All Collaborators":
+        # Layout is computed server-side, so larger networks still render instantly
+        max_nodes = st.slider("Collaborators shown", min_value=25, max_value=500, value=100, step=25)
         stats = netwrk.render_full_network(
             artist_name, 
             artist_songs, 
-            contributor_df,
-            max_nodes=50
+            artist_contributors,
+            max_nodes=max_nodes,
+            artist_id=artist_id,
+            data_version=store.version
         )
     else:
         available_roles = sorted(
-            contributor_df[contributor_df['song_id'].isin(artist_songs['song_id'])]['label'].unique()
+            artist_contributors['label'].unique()
         )
         selected_role = st.selectbox("Select Role to Visualize", options=available_roles)
         
         netwrk.render_role_network(
             artist_name,
             artist_songs,
-            contributor_df,
-            selected_role
+            artist_contributors,
+            selected_role,
+            artist_id=artist_id,
+            data_version=store.version
         )
+
+    st.subheader("Collaboration Path")
+    st.caption("Shortest chain of shared credits to another artist in the catalog")
+    other_artists = store.artists[store.artists['artist_id'] != artist_id]
+    target_name = st.selectbox(
+        "Connect to",
+        options=sorted(other_artists['name'].dropna().unique()),
+        index=None,
+        placeholder="Choose an artist"
+    )
+
+    if target_name:
+        target_id = other_artists.loc[other_artists['name'] == target_name, 'artist_id'].iloc[0]
+        path = get_collab_graph().shortest_path(artist_id, target_id)
+        if path is None:
+            st.info(f"No collaboration path between {artist_name} and {target_name} within 6 hops")
+        else:
+            st.markdown(" → ".join(f"**{name}**" for name in path['name'].astype(str)))
+            st.caption(f"{len(path) - 1} hop(s)")
@@ -1,5 +1,9 @@
 import streamlit as st
-import pandas as pd
+from data_store import get_data_store
+from search_index import TrigramIndex
+
+# Song columns this page reads (projected when loading)
+SONG_COLUMNS = ['song_id', 'title', 'release_date', 'pageviews']
 
 st.set_page_config(page_title="Song Credits", layout="wide")
 
@@ -11,25 +15,19 @@ if st.session_state.selected_artist is None or st.session_state.artist_id is Non
 
 artist_name = st.session_state.selected_artist
 artist_id = st.session_state.artist_id
+store = get_data_store()
 
 st.title(f"🎬 {artist_name}'s Song Credits")
 
-contributor_df = pd.read_parquet("data/contributer_data.parquet")
-song_df = st.session_state.existing_song_df
-artist_df = st.session_state.existing_artist_df
-
 # ============ FILTER TO SELECTED ARTIST'S SONGS ONLY ============
-artist_songs = song_df[song_df['artist_id'] == artist_id].copy()
+artist_songs = store.artist_songs(artist_id, columns=SONG_COLUMNS).copy()
 
 if len(artist_songs) == 0:
     st.info(f"No songs found for {artist_name}")
     st.stop()
 
-# Get song IDs for this artist
-song_ids = artist_songs['song_id'].tolist()
-
-# Filter contributors to only this artist's songs
-artist_contributors = contributor_df[contributor_df['song_id'].isin(song_ids)]
+# Contributors for this artist's songs only (cached in the data store)
+artist_contributors = store.artist_contributors(artist_id)
 
 if len(artist_contributors) == 0:
     st.info(f"No contributor data available for {artist_name}")
@@ -70,14 +68,25 @@ with col3:
 
 filtered_credits = full_credits.copy()
 
-if search_song:
+# Searches go through the store's trigram indexes instead of scanning the text columns
+if search_song.strip():
+    song_ids = store.matches('song_titles', search_song)
     filtered_credits = filtered_credits[
-        filtered_credits['title'].str.contains(search_song, case=False, na=False)
+        filtered_credits['song_id'].isin(song_ids)
     ]
 
-if search_contributor:
+if search_contributor.strip():
+    credited_names = filtered_credits['artist_name'].dropna().unique()
+    contributor_names = store.matches('contributor_names', search_contributor) & set(credited_names)
+    if not contributor_names:
+        # Typo fallback, ranked among the names credited here rather than the whole catalog
+        credited_index = TrigramIndex()
+        credited_index.add_many(credited_names, credited_names)
+        contributor_names = set(credited_index.search(search_contributor, fuzzy=True, limit=10))
+        if contributor_names:
+            st.caption(f"No exact matches for '{search_contributor}', showing similar names")
     filtered_credits = filtered_credits[
-        filtered_credits['artist_name'].str.contains(search_contributor, case=False, na=False)
+        filtered_credits['artist_name'].isin(contributor_names)
     ]
 
 if role_filter:
@@ -1,8 +1,14 @@
 import streamlit as st
-import plotly.graph_objects as go
 import pandas as pd
 import network as netwrk
+import charts
+import aggregates as agg
 from utils import local_css
+from data_store import get_data_store
+from image_cache import image_source, ICON_SIZE
+
+# Song columns this page reads (projected when loading)
+SONG_COLUMNS = ['song_id', 'title', 'release_date', 'pageviews', 'album_cover_art_url']
 
 
 local_css("style.css")
@@ -17,14 +23,14 @@ if st.session_state.artist_id is None:
 
 artist_name = st.session_state.selected_artist
 artist_id = st.session_state.artist_id
+store = get_data_store()
+
+artist_df = store.artist(artist_id)
 
-artist_df = st.session_state.existing_artist_df[
-    st.session_state.existing_artist_df['artist_id'] == artist_id
-]
+artist_songs = store.artist_songs(artist_id, columns=SONG_COLUMNS).copy()
 
-artist_songs = st.session_state.existing_song_df[
-    st.session_state.existing_song_df['artist_id'] == artist_id
-].copy()
+# Materialized per-artist totals (see aggregates.py)
+totals = agg.artist_aggregate('overview', artist_id).iloc[0]
 
 st.title(f"{artist_name}'s Overview")
 
@@ -32,17 +38,16 @@ col1, col2, col3, col4 = st.columns(4)
 
 with col1:
     with st.container(border=True):
-        st.metric("Total Songs", len(artist_songs))
+        st.metric("Total Songs", int(totals['total_songs']))
 
 with col2:
     with st.container(border=True):
-        total_views = artist_songs['pageviews'].sum() if 'pageviews' in artist_songs.columns else 0
-        st.metric("Total Views", f"{int(total_views):,}")
+        st.metric("Total Views", f"{int(totals['total_views']):,}")
 
 with col3:
     with st.container(border=True):
-        if len(artist_songs) > 0 and 'pageviews' in artist_songs.columns:
-            avg_views = artist_songs['pageviews'].mean()
+        if totals['total_songs'] > 0:
+            avg_views = totals['avg_views']
             if pd.notna(avg_views):
                 st.metric("Avg Views/Song", f"{int(avg_views):,}")
             else:
@@ -65,8 +70,11 @@ with row2_col1:
             st.switch_page("pages/collaborators.py")
 
         try:
-            contributor_df = pd.read_parquet("data/contributer_data.parquet")
-            netwrk.render_mini_network(artist_name, artist_songs, contributor_df)
+            contributor_df = store.artist_contributors(artist_id)
+            netwrk.render_mini_network(
+                artist_name, artist_songs, contributor_df,
+                artist_id=artist_id, data_version=store.version
+            )
         except Exception as e:
             st.info("Contributor data not available yet")
             netwrk.render_mini_network(artist_name, artist_songs)
@@ -86,7 +94,7 @@ with row2_col2:
                 try:
                     cover_url = song.get('album_cover_art_url')
                     if pd.notna(cover_url):
-                        st.image(cover_url, width=50)
+                        st.image(image_source(cover_url, ICON_SIZE), width=50)
                     else:
                         st.write("🎵")
                 except Exception:
@@ -120,52 +128,7 @@ with st.container(border=True):
         timeline_df = artist_songs_copy.dropna(subset=['release_date']).sort_values('release_date')
         
         if len(timeline_df) > 0 and 'pageviews' in timeline_df.columns:
-            fig = go.Figure()
-            
-            for _, row in timeline_df.iterrows():
-                fig.add_trace(go.Scatter(
-                    x=[row['release_date'], row['release_date']],
-                    y=[0, row['pageviews']],
-                    mode='lines',
-                    line=dict(color='rgba(255,75,75,0.3)', width=3),
-                    showlegend=False,
-                    hoverinfo='none'
-                ))
-            
-            fig.add_trace(go.Scatter(
-                x=timeline_df['release_date'],
-                y=timeline_df['pageviews'],
-                mode='markers',
-                marker=dict(
-                    size=12,
-                    color=timeline_df['pageviews'],
-                    colorscale='Plasma',
-                    showscale=False
-                ),
-                text=timeline_df['title'],
-                hovertemplate="<b>%{text}</b><br>%{x|%b %Y}<br>Views: %{y:,}<extra></extra>",
-                showlegend=False
-            ))
-            
-            fig.update_layout(
-                paper_bgcolor='rgba(0,0,0,0)',
-                plot_bgcolor='rgba(0,0,0,0)',
-                height=350,
-                xaxis=dict(
-                    showgrid=False,
-                    showline=True,
-                    linecolor='#333',
-                    tickfont=dict(color='#888')
-                ),
-                yaxis=dict(
-                    showgrid=True,
-                    gridcolor='#333',
-                    gridwidth=1,
-                    tickfont=dict(color='#888'),
-                    title="Page Views"
-                ),
-                margin=dict(l=0, r=0, t=20, b=0)
-            )
+            fig = charts.release_timeline(timeline_df)
             st.plotly_chart(fig, width='stretch')
         else:
             st.info("No release date information available")
@@ -1,6 +1,12 @@
 import streamlit as st
+import math
 import pandas as pd
 import plotly.express as px
+from data_store import get_data_store
+from image_cache import get_image_cache, CARD_SIZE
+
+# Cards drawn per page; only the current page is built
+PAGE_SIZES = [12, 24, 48]
 
 st.set_page_config(page_title="Song Details", layout="wide")
 
@@ -14,9 +20,8 @@ if st.session_state.artist_id is None:
 
 artist_name = st.session_state.selected_artist
 artist_id = st.session_state.artist_id
-artist_songs = st.session_state.existing_song_df[
-    st.session_state.existing_song_df['artist_id'] == artist_id
-].copy()
+store = get_data_store()
+artist_songs = store.artist_song_cards(artist_id)
 
 st.title(f"📀 {artist_name}'s Discography")
 if len(artist_songs) == 0:
@@ -37,7 +42,6 @@ with col2:
 
 with col3:
     if 'release_date' in artist_songs.columns:
-        artist_songs['release_date'] = pd.to_datetime(artist_songs['release_date'], errors='coerce')
         valid_dates = artist_songs['release_date'].dropna()
         if len(valid_dates) > 0:
             min_year = int(valid_dates.min().year)
@@ -69,28 +73,43 @@ if 'release_date' in artist_songs.columns:
     ]
 st.divider()
 
+col_page_size, col_page, col_count = st.columns([1, 1, 2])
+with col_page_size:
+    page_size = st.selectbox("Songs per page", options=PAGE_SIZES, index=1)
+total_pages = max(1, math.ceil(len(artist_songs) / page_size))
+with col_page:
+    page = st.number_input(f"Page (of {total_pages})", min_value=1, max_value=total_pages, value=1, step=1)
+
+first = (page - 1) * page_size
+page_songs = artist_songs.iloc[first:first + page_size]
+with col_count:
+    if len(page_songs) > 0:
+        st.caption(f"Showing {first + 1}-{first + len(page_songs)} of {len(artist_songs)} songs")
+    else:
+        st.caption("No songs in the selected years")
+
+# Thumbnails of the visible page, from the local image cache (downloaded concurrently on first view)
+page_images = get_image_cache().get_many(page_songs['image_url'], max_size=CARD_SIZE)
+
 cols_per_row = 3
-rows = (len(artist_songs) + cols_per_row - 1) // cols_per_row
+rows = (len(page_songs) + cols_per_row - 1) // cols_per_row
 
 for row in range(rows):
     cols = st.columns(cols_per_row)
     for col_idx in range(cols_per_row):
         song_idx = row * cols_per_row + col_idx
-        if song_idx < len(artist_songs):
-            song = artist_songs.iloc[song_idx]
+        if song_idx < len(page_songs):
+            song = page_songs.iloc[song_idx]
             
             with cols[col_idx]:
                 with st.container(border=True):
-                    if pd.notna(song.get('album_cover_art_url')):
-                        st.image(song['album_cover_art_url'], width='stretch')
+                    if pd.notna(song['image_url']):
+                        st.image(page_images[song_idx] or song['image_url'], width='stretch')
 
                     st.subheader(song['title'])
 
-                    if pd.notna(song.get('release_date')):
-                        try:
-                            st.caption(f"📅 {pd.to_datetime(song['release_date']).strftime('%B %d, %Y')}")
-                        except:
-                            st.caption(f"📅 {song['release_date']}")
+                    if pd.notna(song['release_label']):
+                        st.caption(f"📅 {song['release_label']}")
 
-                    if pd.notna(song.get('pageviews')):
-                        st.metric("Views", f"{int(song['pageviews']):,}")
+                    if pd.notna(song['views_label']):
+                        st.metric("Views", song['views_label'])
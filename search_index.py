@@ -0,0 +1,131 @@
+import unicodedata
+from collections import Counter
+
+
+def normalize_text(text):
+    """Casefolded, accent-free, single-spaced text, so 'Beyoncé ' matches 'beyonce'."""
+    text = unicodedata.normalize('NFKD', str(text))
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.split()).casefold()
+
+
+def ngrams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class TrigramIndex():
+    """
+    In-memory inverted index from the 1-, 2- and 3-grams of normalized text to entries (key, text).
+    A key can have several texts (e.g. an artist's name and alternate names); texts added as
+    primary take precedence in lookup() over the others, whatever order they were added in.
+
+    search() finds substrings (like str.contains, case- and accent-insensitive) by intersecting
+    the postings of the query's trigrams and checking the few candidates, ranks exact matches and
+    prefixes first, and with fuzzy=True falls back to trigram similarity for typos.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.texts = []
+        self.trigram_counts = []
+        self.entries = set()
+        self.postings = {}
+        self.exact = {}
+        self.primary = {}
+
+
+    def __len__(self):
+        return len(self.keys)
+
+
+    def add(self, key, text, primary=False):
+        if not isinstance(text, str) or not text.strip():
+            return
+        text = normalize_text(text)
+        if primary:
+            self.primary.setdefault(text, key)
+        if (key, text) in self.entries:
+            return
+
+        entry = len(self.keys)
+        self.keys.append(key)
+        self.texts.append(text)
+        self.trigram_counts.append(len(ngrams(text, 3)))
+        self.entries.add((key, text))
+        self.exact.setdefault(text, key)
+
+        for n in (1, 2, 3):
+            for gram in ngrams(text, n):
+                self.postings.setdefault(gram, set()).add(entry)
+
+
+    def add_many(self, keys, texts, primary=False):
+        for key, text in zip(keys, texts):
+            self.add(key, text, primary)
+
+
+    def lookup(self, text):
+        """Key whose text equals text after normalization (primary texts first), or None."""
+        text = normalize_text(text)
+        return self.primary.get(text, self.exact.get(text))
+
+
+    def _candidates(self, query):
+        if len(query) <= 3:
+            return self.postings.get(query, set())
+
+        grams = sorted((self.postings.get(gram, set()) for gram in ngrams(query, 3)), key=len)
+        candidates = set(grams[0])
+        for posting in grams[1:]:
+            candidates &= posting
+            if not candidates:
+                break
+        return {entry for entry in candidates if query in self.texts[entry]}
+
+
+    def _rank(self, entry, query):
+        text = self.texts[entry]
+        if text == query:
+            return 0
+        if text.startswith(query):
+            return 1
+        if f" {query}" in text:
+            return 2
+        return 3
+
+
+    def _similar(self, query, min_similarity):
+        """Entries sharing enough trigrams with the query (Jaccard similarity), best first."""
+        query_grams = ngrams(query, 3)
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self.postings.get(gram, ()))
+
+        scored = []
+        for entry, count in shared.items():
+            similarity = count / (len(query_grams) + self.trigram_counts[entry] - count)
+            if similarity >= min_similarity:
+                scored.append((-similarity, entry))
+        return [entry for _, entry in sorted(scored)]
+
+
+    def matches(self, query):
+        """Set of keys whose text contains query, unranked (for filtering)."""
+        query = normalize_text(query)
+        if not query:
+            return set()
+        return {self.keys[entry] for entry in self._candidates(query)}
+
+
+    def search(self, query, limit=None, fuzzy=False, min_similarity=0.3):
+        """Keys whose text contains query, best matches first (exact, prefix, word prefix, substring)."""
+        query = normalize_text(query)
+        if not query:
+            return []
+
+        entries = sorted(self._candidates(query), key=lambda entry: (self._rank(entry, query), entry))
+        if not entries and fuzzy:
+            entries = self._similar(query, min_similarity)
+
+        keys = list(dict.fromkeys(self.keys[entry] for entry in entries))
+        return keys if limit is None else keys[:limit]
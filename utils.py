@@ -2,11 +2,13 @@ import os
 import streamlit as st
 import pandas as pd
 import json
-import time
 from dotenv import load_dotenv
 from genius_client import GeniusClient
 import data_prep as dp
 import data_update as du
+import aggregates as agg
+from data_store import get_data_store
+from dataset import SONG_DATA
 
 
 load_dotenv()
@@ -15,6 +17,9 @@ load_dotenv()
 TOKEN = os.getenv("TOKEN")
 client = GeniusClient(TOKEN)
 
+# Parallel song requests; the client's token bucket keeps them within the API quota
+CONTRIBUTOR_WORKERS = 8
+
 def local_css(file_name):
     with open(file_name) as f:
         st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
@@ -23,13 +28,8 @@ def local_css(file_name):
 
 def get_artist_id_from_local(artist_name):
     """Get artist ID from local data without API call"""
-    existing_artist = st.session_state.existing_artist_df[
-        st.session_state.existing_artist_df['name'].str.lower() == artist_name.lower()
-    ]
-    
-    if not existing_artist.empty:
-        return existing_artist.iloc[0]['artist_id']
-    return None
+    # Indexed lookup on name and alternate_names, case- and accent-insensitive
+    return get_data_store().find_artist_id(artist_name)
 
 def load_or_fetch_artist(artist_name, fetch_contributors=True):
     """Load artist from local data or fetch from API if not found"""
@@ -46,13 +46,13 @@ def load_or_fetch_artist(artist_name, fetch_contributors=True):
             st.error(f"Could not find artist '{artist_name}': {e}")
             return None
 
-    if artist_id in st.session_state.existing_artist_df['artist_id'].values:
+    if artist_id in get_data_store().artists['artist_id'].values:
         return artist_id
 
     with st.spinner(f'Fetching {artist_name} data from Genius API...'):
         try:
-            new_artist_df = dp.prep_artist_data(client, artist_name, update_artist_data=False)
-            new_artist_song_df = dp.prep_artist_song_data(client, artist_name, update_artist_song_data=False)
+            new_artist_df = dp.prep_artist_data(client, artist_name, update_artist_data=False, artist_id=artist_id)
+            new_artist_song_df = dp.prep_artist_song_data(client, artist_name, update_artist_song_data=False, artist_id=artist_id)
 
             if new_artist_df.empty:
                 st.warning(f"No artist data found for '{artist_name}'")
@@ -74,7 +74,7 @@ def load_or_fetch_artist(artist_name, fetch_contributors=True):
                         lambda x: json.dumps(x) if isinstance(x, (dict, list)) else None
                     )
             
-            existing_columns = st.session_state.existing_song_df.columns.tolist()
+            existing_columns = SONG_DATA.columns()
             new_artist_song_df = new_artist_song_df.reindex(columns=existing_columns)
 
             du.update_artist_data(new_artist_df)
@@ -84,16 +84,8 @@ def load_or_fetch_artist(artist_name, fetch_contributors=True):
             if fetch_contributors:
                 with st.spinner(f'🎵 Fetching contributors for {artist_name}...'):
                     contributor_count = fetch_and_update_contributors(artist_name, new_artist_song_df)
-            
-            # Update session state
-            st.session_state.existing_artist_df = pd.concat(
-                [st.session_state.existing_artist_df, new_artist_df], 
-                ignore_index=True
-            )
-            st.session_state.existing_song_df = pd.concat(
-                [st.session_state.existing_song_df, new_artist_song_df], 
-                ignore_index=True
-            )
+
+            agg.refresh_artist_aggregates(artist_id)
             
             if contributor_count > 0:
                 st.success(f"✅ Successfully added {artist_name} with {contributor_count} collaborators!")
@@ -119,46 +111,28 @@ def fetch_and_update_contributors(artist_name, song_df):
     Returns:
         int: Number of unique collaborators found, or 0 if none
     """
-    all_contributors = []
-    
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    song_ids = song_df['song_id'].tolist()
-    total_songs = len(song_ids)
+    def show_progress(done, total_songs):
+        progress_bar.progress(done / total_songs)
+        status_text.text(f"Processing {done}/{total_songs} songs...")
     
-    for idx, song_id in enumerate(song_ids):
-        try:
-            contributors = dp.prep_contributer_data(client, song_id)
-            
-            if len(contributors) > 0:
-                all_contributors.append(contributors)
-            
-            progress_bar.progress((idx + 1) / total_songs)
-            status_text.text(f"Processing {idx + 1}/{total_songs} songs...")
-            
-            time.sleep(0.7)
-            
-        except KeyError:
-            time.sleep(0.3)
-        except Exception:
-            time.sleep(0.3)
-            continue
+    song_ids = song_df['song_id'].tolist()
+    _, contributor_df = dp.enrich_songs(
+        client, song_ids, max_workers=CONTRIBUTOR_WORKERS, on_progress=show_progress
+    )
     
     progress_bar.empty()
     status_text.empty()
     
-    if all_contributors:
-        contributor_df = pd.concat(all_contributors, ignore_index=True)
+    if len(contributor_df) > 0:
         contributor_df = contributor_df.drop_duplicates()
         
-        du.update_contributer_data(contributor_df)
-        
-        if 'existing_contributor_df' in st.session_state:
-            st.session_state.existing_contributor_df = pd.concat(
-                [st.session_state.existing_contributor_df, contributor_df],
-                ignore_index=True
-            ).drop_duplicates()
+        artist_ids = song_df['artist_id'].dropna().unique()
+        du.update_contributer_data(
+            contributor_df, artist_id=int(artist_ids[0]) if len(artist_ids) == 1 else None
+        )
         
         return contributor_df['artist_name'].nunique()
     